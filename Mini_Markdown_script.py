@@ -3,51 +3,309 @@
 
 import re
 import sys
+import io
 import os
 import shutil
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import (
+    Qt, QEvent, QTimer, QObject, QIODevice, QProcess, QRegularExpression, QRunnable, QSaveFile,
+    QThreadPool, Signal
+)
 from PySide6.QtGui import QTextCursor
 from PySide6.QtGui import QAction, QKeySequence, QFont, QTextDocument
+from PySide6.QtGui import QColor, QSyntaxHighlighter, QTextCharFormat
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QFileDialog, QMessageBox,
     QPlainTextEdit, QTextEdit, QSplitter
 )
-from PySide6.QtPrintSupport import QPrinter
 
 
 # -----------------------------
 # DOCX export (Markdown -> docx)
 # -----------------------------
 
-INLINE_RE = re.compile(r"(\*\*.+?\*\*|\*.+?\*|`.+?`)", re.DOTALL)
+CODE_FONT_NAME = "Consolas"
+
+def _classify_line(line: str) -> tuple:
+    """
+    Classe une ligne Markdown d’après ses premiers caractères (sans regex) :
+    ("fence",), ("heading", niveau, texte), ("bullet", texte), ("num", texte),
+    ("blank",) ou ("para", ligne).
+    """
+    s = line.lstrip()
+    if not s:
+        return ("blank",)
+    if s.startswith("```"):
+        return ("fence",)
+    n = len(s)
+    c = s[0]
+
+    # Titre : 1 à 6 '#' en début de ligne (sans indentation) suivis d’un espace
+    if c == "#" and n == len(line):
+        i = 1
+        while i < n and s[i] == "#":
+            i += 1
+        if i <= 6 and i < n and s[i].isspace():
+            return ("heading", i, s[i:].strip())
+        return ("para", line)
+
+    # Puce : '-' ou '*' suivi d’un espace
+    if c in "-*":
+        if n > 1 and s[1].isspace():
+            return ("bullet", s[1:].strip())
+        return ("para", line)
+
+    # Liste numérotée : chiffres, '.', espace
+    if c.isdecimal():
+        i = 1
+        while i < n and s[i].isdecimal():
+            i += 1
+        if s[i:i + 1] == "." and s[i + 1:i + 2].isspace():
+            return ("num", s[i + 1:].strip())
+
+    return ("para", line)
+
+# Caractères pouvant ouvrir un segment inline (gras/italique/code)
+INLINE_DELIM_RE = re.compile(r"[*`]")
+
+def _iter_inline_spans(text: str):
+    """
+    Découpe une ligne en segments (kind, payload), kind ∈ text/bold/italic/code.
+    Un seul passage sur la chaîne (INLINE_DELIM_RE pour les délimiteurs
+    ouvrants, str.find pour les fermants).
+    Un délimiteur ouvrant sans fermeture reste du texte littéral ; un find qui
+    échoue prouve qu’il n’y a plus de délimiteur de ce type plus loin, donc la
+    recherche jusqu’au bout de la ligne n’a lieu qu’une fois : coût linéaire.
+    """
+    n = len(text)
+    start = 0  # début du texte littéral en attente
+    search = INLINE_DELIM_RE.search
+    m = search(text)
+    i = m.start() if m else n
+    while i < n:
+        c = text[i]
+        if c == "`":
+            j = text.find("`", i + 2)
+            if j != -1:
+                if start < i:
+                    yield "text", text[start:i]
+                yield "code", text[i + 1:j]
+                i = start = j + 1
+                continue
+        elif c == "*":
+            if text.startswith("**", i):
+                j = text.find("**", i + 3)
+                if j != -1:
+                    if start < i:
+                        yield "text", text[start:i]
+                    yield "bold", text[i + 2:j]
+                    i = start = j + 2
+                    continue
+            j = text.find("*", i + 2)
+            if j != -1:
+                if start < i:
+                    yield "text", text[start:i]
+                yield "italic", text[i + 1:j]
+                i = start = j + 1
+                continue
+        m = search(text, i + 1)
+        i = m.start() if m else n
+    if start < n:
+        yield "text", text[start:]
+
+@lru_cache(maxsize=4096)
+def _inline_spans(text: str) -> tuple[tuple[str, str], ...]:
+    """
+    Segments inline d’une ligne, mémorisés : un nouvel export du même document
+    (ou des lignes répétées) ne rescanne pas les lignes déjà vues.
+    """
+    # Aucun délimiteur (cas le plus courant) : un seul segment, sans boucle Python
+    if "*" not in text and "`" not in text:
+        return (("text", text),) if text else ()
+    return tuple(_iter_inline_spans(text))
+
+def _parse_line(line: str) -> tuple:
+    """Élément de _md_parse pour une ligne hors bloc de code."""
+    kind = _classify_line(line)
+    tag = kind[0]
+    if tag == "bullet" or tag == "num":
+        return tag, _inline_spans(kind[1])
+    if tag == "para":
+        return "para", _inline_spans(line)
+    return kind
+
+# Fins de ligne Markdown : \r\n, \r ou \n (str.splitlines coupe aussi sur \f, \x85,
+# U+2028…, que l’on garde dans le texte)
+LINE_BREAK_RE = re.compile(r"\r\n?|\n")
+
+def _md_parse(md: str) -> Iterator[tuple]:
+    """
+    Analyse le Markdown élément par élément (générateur : l’export consomme au
+    fur et à mesure, sans liste intermédiaire), sans dépendre de python-docx :
+    ("heading", niveau, texte), ("bullet", spans), ("num", spans), ("para", spans),
+    ("code", lignes), ("blank",) — spans = tuple de (kind, payload) inline,
+    lignes = tuple des lignes d’un bloc de code.
+    """
+    # Un seul passage, sans copie intermédiaire du texte normalisé
+    lines = LINE_BREAK_RE.split(md)
 
-def _add_inlines_docx(paragraph, text: str):
+    # Cas courant : aucun bloc de code, pas d’état à suivre ligne à ligne
+    if "```" not in md:
+        yield from map(_parse_line, lines)
+        return
+
+    code = None  # lignes du bloc de code en cours
+    for line in lines:
+        # Code fence (un bloc non fermé court jusqu’à la fin du texte) ; le test
+        # `in` écarte la plupart des lignes sans construire la copie lstrip()
+        if "```" in line and line.lstrip().startswith("```"):
+            if code is None:
+                code = []
+            else:
+                if code:
+                    yield ("code", tuple(code))
+                code = None
+        elif code is not None:
+            code.append(line)
+        else:
+            yield _parse_line(line)
+    if code:
+        yield ("code", tuple(code))
+
+def _docx_run_formats(code_pt) -> dict:
+    """
+    Propriétés de run (w:rPr) par kind inline, construites une seule fois par
+    export puis copiées dans chaque run (None = texte sans mise en forme).
+    """
+    from copy import deepcopy
+    from docx.oxml import OxmlElement
+    from docx.text.run import Run
+
+    def rpr(setup):
+        r = OxmlElement("w:r")
+        setup(Run(r, None))
+        return deepcopy(r.rPr)
+
+    def code(run):
+        run.font.name = CODE_FONT_NAME
+        run.font.size = code_pt
+
+    return {
+        "text": None,
+        "bold": rpr(lambda run: setattr(run, "bold", True)),
+        "italic": rpr(lambda run: setattr(run, "italic", True)),
+        "code": rpr(code),
+    }
+
+# Noms qualifiés WordprocessingML utilisés pour construire les runs
+_W_R = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}r"
+_W_T = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t"
+_W_BR = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}br"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+def _docx_ppr(style_id: str):
+    """w:pPr (avec son w:pStyle) à copier dans chaque paragraphe de ce style."""
+    from docx.oxml import OxmlElement
+
+    p = OxmlElement("w:p")
+    p.style = style_id
+    return p.pPr
+
+# (OxmlElement, SubElement, deepcopy) : importés au premier export seulement
+# (python-docx optionnel), puis réutilisés pour chaque paragraphe
+_DOCX_OXML = None
+
+def _docx_oxml():
+    global _DOCX_OXML
+    if _DOCX_OXML is None:
+        from copy import deepcopy
+        from lxml.etree import SubElement
+        from docx.oxml import OxmlElement
+        _DOCX_OXML = (OxmlElement, SubElement, deepcopy)
+    return _DOCX_OXML
+
+def _docx_keep_lines_ppr():
+    """w:pPr « lignes solidaires » (keep_together) pour les blocs de code."""
+    from docx.oxml import OxmlElement
+    from docx.text.paragraph import Paragraph
+
+    p = OxmlElement("w:p")
+    Paragraph(p, None).paragraph_format.keep_together = True
+    return p.pPr
+
+def _docx_code_paragraph(lines, rpr, ppr):
+    """
+    Bloc de code en un seul w:p : un w:r monospace dont les lignes sont
+    séparées par des w:br (au lieu d’un paragraphe + run par ligne).
+    """
+    OxmlElement, SubElement, deepcopy = _docx_oxml()
+
+    p = OxmlElement("w:p")
+    p.append(deepcopy(ppr))
+    r = SubElement(p, _W_R)
+    r.append(deepcopy(rpr))
+    if any("\t" in line for line in lines):
+        # Tabulations : le setter de python-docx produit w:t/w:tab/w:br
+        r.text = "\n".join(lines)
+        return p
+    for i, line in enumerate(lines):
+        if i:
+            SubElement(r, _W_BR)
+        if line:
+            t = SubElement(r, _W_T)
+            t.text = line
+            if len(line.strip()) < len(line):
+                t.set(_XML_SPACE, "preserve")
+    return p
+
+def _docx_paragraph(spans, formats: dict, ppr=None):
     """
     Minimal inline markdown -> docx runs:
     **bold**, *italic*, `code`
     (Pas de gestion d’imbrication complexe : volontairement simple.)
+    Le w:p est construit en une fois : pPr et rPr copiés depuis des modèles,
+    w:r/w:t créés par SubElement, sans add_paragraph/add_run ni leurs setters.
     """
-    from docx.shared import Pt  # lazy import
-
-    parts = INLINE_RE.split(text)
-    for part in parts:
-        if not part:
-            continue
-        if part.startswith("**") and part.endswith("**") and len(part) >= 4:
-            run = paragraph.add_run(part[2:-2])
-            run.bold = True
-        elif part.startswith("*") and part.endswith("*") and len(part) >= 2:
-            run = paragraph.add_run(part[1:-1])
-            run.italic = True
-        elif part.startswith("`") and part.endswith("`") and len(part) >= 2:
-            run = paragraph.add_run(part[1:-1])
-            run.font.name = "Consolas"
-            run.font.size = Pt(10)
+    OxmlElement, SubElement, deepcopy = _docx_oxml()
+
+    p = OxmlElement("w:p")
+    if ppr is not None:
+        p.append(deepcopy(ppr))
+    for kind, payload in spans:
+        r = SubElement(p, _W_R)
+        rpr = formats[kind]
+        if rpr is not None:
+            r.append(deepcopy(rpr))
+        if payload and "\t" not in payload:
+            # Cas courant : un seul w:t (le setter r.text traite caractère par caractère)
+            t = SubElement(r, _W_T)
+            t.text = payload
+            if len(payload.strip()) < len(payload):
+                t.set(_XML_SPACE, "preserve")
         else:
-            paragraph.add_run(part)
+            r.text = payload
+    return p
+
+# Modèle .docx par défaut de python-docx, lu une seule fois (au premier export)
+_DOCX_TEMPLATE_BYTES: bytes | None = None
+
+def _new_docx_document():
+    """Document vierge créé depuis le modèle en mémoire (pas de relecture disque)."""
+    global _DOCX_TEMPLATE_BYTES
+    from docx import Document
+
+    if _DOCX_TEMPLATE_BYTES is None:
+        import docx
+        tpl = Path(docx.__file__).parent / "templates" / "default.docx"
+        _DOCX_TEMPLATE_BYTES = tpl.read_bytes()
+    return Document(io.BytesIO(_DOCX_TEMPLATE_BYTES))
 
 def export_docx_from_markdown(md: str, out_path: Path):
     """
@@ -57,127 +315,476 @@ def export_docx_from_markdown(md: str, out_path: Path):
     - Paragraphes
     - Blocs de code ``` ... ```
     - Inline ** * ``
+    L’analyse est faite par _md_parse ; ici on ne fait que produire les w:p.
     """
-    from docx import Document
     from docx.shared import Pt
+    from docx.text.paragraph import Paragraph
+
+    doc = _new_docx_document()
+    formats = _docx_run_formats(Pt(10))
+    blank_space = Pt(6)
+    # Styles résolus une fois (pPr modèle) : add_paragraph(style="…") refait la
+    # recherche par nom (et celle du style par défaut) à chaque paragraphe
+    styles = doc.styles
+    list_pprs = {
+        "bullet": _docx_ppr(styles["List Bullet"].style_id),
+        "num": _docx_ppr(styles["List Number"].style_id),
+    }
+    heading_pprs = {}
+    code_ppr = _docx_keep_lines_ppr()
+
+    paragraphs = []
+    append = paragraphs.append
+    for item in _md_parse(md):
+        tag = item[0]
+        if tag == "code":
+            # Un bloc de code simple (un paragraphe monospace, retours à la ligne)
+            append(_docx_code_paragraph(item[1], formats["code"], code_ppr))
+        elif tag == "heading":
+            level, text = item[1], item[2]
+            if level not in heading_pprs:
+                heading_pprs[level] = _docx_ppr(styles[f"Heading {level}"].style_id)
+            append(_docx_paragraph((("text", text),) if text else (), formats, heading_pprs[level]))
+        elif tag == "bullet" or tag == "num":
+            append(_docx_paragraph(item[1], formats, list_pprs[tag]))
+        elif tag == "blank":
+            # Ligne vide => espacement après le paragraphe précédent plutôt qu’un
+            # w:p vide (les lignes vides consécutives n’en font qu’un)
+            if paragraphs:
+                Paragraph(paragraphs[-1], None).paragraph_format.space_after = blank_space
+        else:
+            # Paragraphe normal
+            append(_docx_paragraph(item[1], formats))
 
-    doc = Document()
+    # Insertion en une fois, avant le w:sectPr final du corps
+    body = doc.element.body
+    sect = body.sectPr
+    at = body.index(sect) if sect is not None else len(body)
+    body[at:at] = paragraphs
 
-    in_code = False
-    code_lines = []
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(out_path))
 
-    lines = md.replace("\r\n", "\n").replace("\r", "\n").split("\n")
 
-    def flush_code():
-        nonlocal code_lines
-        if not code_lines:
-            return
-        # Un bloc de code simple (une série de paragraphes monospace)
-        for cl in code_lines:
-            p = doc.add_paragraph()
-            run = p.add_run(cl)
-            run.font.name = "Consolas"
-            run.font.size = Pt(10)
-        code_lines = []
+# -----------------------------
+# Coloration Markdown (éditeur)
+# -----------------------------
 
-    for line in lines:
-        # Code fence
-        if line.strip().startswith("```"):
-            if not in_code:
-                in_code = True
-                code_lines = []
-            else:
-                in_code = False
-                flush_code()
-            continue
+# Au-delà (fichier ouvert), pas de coloration : la passe initiale sur tout le
+# document (un appel Python par ligne) rendrait l’ouverture lente
+HIGHLIGHT_MAX_CHARS = 200_000
+
+class MarkdownHighlighter(QSyntaxHighlighter):
+    """
+    Coloration légère du Markdown dans l’éditeur. Qt ne rappelle highlightBlock
+    que pour les lignes modifiées (et les suivantes si l’état de bloc change) :
+    coût proportionnel à l’édition, pas à la taille du document.
+    État de bloc : 1 = à l’intérieur d’un bloc de code ```.
+    """
+    HEADING_RE = QRegularExpression(r"^#{1,6}\s.*$")
+    FENCE_RE = QRegularExpression(r"^\s*```")
+    LIST_RE = QRegularExpression(r"^\s*(?:[-*+]|\d+\.)\s")
+    QUOTE_RE = QRegularExpression(r"^\s*>")
+    BOLD_RE = QRegularExpression(r"\*\*[^*]+\*\*")
+    ITALIC_RE = QRegularExpression(r"(?<!\*)\*[^*\s][^*]*\*(?!\*)")
+    CODE_RE = QRegularExpression(r"`[^`]+`")
+    LINK_RE = QRegularExpression(r"!?\[[^\]]*\]\([^)]*\)")
+
+    def __init__(self, document: QTextDocument):
+        super().__init__(document)
+
+        self.fmt_heading = QTextCharFormat()
+        self.fmt_heading.setFontWeight(QFont.Bold)
+        self.fmt_heading.setForeground(QColor("#1f4e79"))
+
+        self.fmt_bold = QTextCharFormat()
+        self.fmt_bold.setFontWeight(QFont.Bold)
+
+        self.fmt_italic = QTextCharFormat()
+        self.fmt_italic.setFontItalic(True)
+
+        self.fmt_code = QTextCharFormat()
+        self.fmt_code.setForeground(QColor("#8b2252"))
+        self.fmt_code.setBackground(QColor("#f3f3f3"))
+
+        self.fmt_link = QTextCharFormat()
+        self.fmt_link.setForeground(QColor("#1a5fb4"))
+
+        self.fmt_marker = QTextCharFormat()
+        self.fmt_marker.setForeground(QColor("#777777"))
+
+        # (regex, format) appliqués dans l’ordre aux lignes hors bloc de code
+        self.inline_rules = (
+            (self.BOLD_RE, self.fmt_bold),
+            (self.ITALIC_RE, self.fmt_italic),
+            (self.LINK_RE, self.fmt_link),
+            (self.CODE_RE, self.fmt_code),
+        )
+
+    def highlightBlock(self, text: str):
+        in_code = self.previousBlockState() == 1
 
+        if self.FENCE_RE.match(text).hasMatch():
+            self.setFormat(0, len(text), self.fmt_code)
+            self.setCurrentBlockState(0 if in_code else 1)
+            return
         if in_code:
-            code_lines.append(line)
-            continue
-
-        # Titres
-        m = re.match(r"^(#{1,6})\s+(.*)$", line)
-        if m:
-            level = len(m.group(1))
-            text = m.group(2).strip()
-            doc.add_heading(text, level=level)
-            continue
-
-        # Listes
-        m_bullet = re.match(r"^\s*[-*]\s+(.*)$", line)
-        if m_bullet:
-            p = doc.add_paragraph(style="List Bullet")
-            _add_inlines_docx(p, m_bullet.group(1).strip())
-            continue
-
-        m_num = re.match(r"^\s*\d+\.\s+(.*)$", line)
-        if m_num:
-            p = doc.add_paragraph(style="List Number")
-            _add_inlines_docx(p, m_num.group(1).strip())
-            continue
-
-        # Ligne vide => séparation (Word gère assez bien sans forcer)
-        if not line.strip():
-            doc.add_paragraph("")
-            continue
-
-        # Paragraphe normal
-        p = doc.add_paragraph()
-        _add_inlines_docx(p, line)
-
-    # Si code non fermé
-    if in_code:
-        flush_code()
+            self.setFormat(0, len(text), self.fmt_code)
+            self.setCurrentBlockState(1)
+            return
+        self.setCurrentBlockState(0)
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    doc.save(str(out_path))
+        # Lignes sans balisage (cas courant) : rien à chercher
+        if not text:
+            return
+        if self.HEADING_RE.match(text).hasMatch():
+            self.setFormat(0, len(text), self.fmt_heading)
+            return
+        m = self.LIST_RE.match(text)
+        if not m.hasMatch():
+            m = self.QUOTE_RE.match(text)
+        if m.hasMatch():
+            self.setFormat(0, m.capturedEnd(), self.fmt_marker)
+
+        if "*" not in text and "`" not in text and "[" not in text:
+            return
+        for rx, fmt in self.inline_rules:
+            it = rx.globalMatch(text)
+            while it.hasNext():
+                m = it.next()
+                self.setFormat(m.capturedStart(), m.capturedLength(), fmt)
 
 
 # -----------------------------
 # Preview (éditable) + autosave
 # -----------------------------
 
+# Aperçu incrémental : le Markdown est découpé en segments séparés par des lignes vides
+BLANK_LINES_RE = re.compile(r"\n(?:[ \t]*\n)+")
+
+# Au-delà, un rendu complet coûte moins que les rendus séparés des segments
+PATCH_MAX_SEGMENTS = 8
+# Segments jamais vus dont on compte les blocs par frappe : compter d’un coup tout un
+# gros document coûterait plusieurs rendus complets (rendu complet en attendant)
+PATCH_COUNT_BUDGET = 64
+
+def _split_segments(md: str) -> list[str]:
+    return BLANK_LINES_RE.split(md.strip("\n"))
+
+# Éléments de liste (éventuellement vides ou dans une citation)
+LIST_LINE_RE = re.compile(r"^[ \t>]*(?:[-*+]|\d+[.)])(?:[ \t]|$)", re.MULTILINE)
+EMPTY_ITEM_RE = re.compile(r"^[ \t>]*(?:[-*+]|\d+[.)])[ \t]*$", re.MULTILINE)
+
+def _is_list_segment(seg: str) -> bool:
+    return LIST_LINE_RE.search(seg) is not None
+
+def _segment_is_isolated(seg: str) -> bool:
+    """
+    Un segment se rend seul comme dans le document complet, sauf s’il est
+    indenté (suite d’un bloc précédent) ou contient une table (Qt ajoute un
+    bloc vide devant une table en tête de document).
+    """
+    return seg[:1] not in (" ", "\t") and "|" not in seg
+
+def _render_segment(seg: str, font: QFont) -> QTextDocument:
+    # Même police que l’aperçu : les marges des paragraphes en dépendent
+    doc = QTextDocument()
+    doc.setDefaultFont(font)
+    doc.setMarkdown(seg)
+    return doc
+
+@lru_cache(maxsize=8)
+def _reference_formats(font_key: str) -> tuple:
+    """Formats (bloc, caractères du bloc, du texte) d’un paragraphe « x » après un autre."""
+    font = QFont()
+    font.fromString(font_key)
+    doc = _render_segment("x\n\nx", font)  # gardé en vie le temps de lire ses blocs
+    last = doc.lastBlock()
+    return last.blockFormat(), last.charFormat(), last.begin().fragment().charFormat()
+
+def _segment_block_count(seg: str, font: QFont) -> int | None:
+    """
+    Nombre de blocs Qt produits par le segment, ou None si son rendu déborde
+    sur la suite : après certaines listes Qt garde un état d’indentation, une
+    emphase non fermée peut continuer dans le paragraphe suivant.
+    """
+    doc = _render_segment(seg + "\n\nx", font)
+    last = doc.lastBlock()
+    if last.text() != "x" or (
+            last.blockFormat(), last.charFormat(), last.begin().fragment().charFormat()
+    ) != _reference_formats(font.toString()):
+        return None
+    return doc.blockCount() - 1
+
+def _fragment_is_patchable(doc: QTextDocument) -> bool:
+    """
+    Rendu de segments insérable tel quel dans l’aperçu : aucun bloc vide. Un
+    segment réduit à un marqueur (titre vide, « > », ligne « --- »…) donne un
+    bloc vide dont Qt ne garde ni la place ni le format une fois inséré.
+    """
+    block = doc.begin()
+    while block.isValid():
+        if not block.text():
+            return False
+        block = block.next()
+    return True
+
+# Gros document : l’aperçu (rendu Qt) ne montre qu’une fenêtre de lignes autour
+# du curseur de l’éditeur, de PREVIEW_WINDOW_LINES lignes de part et d’autre ;
+# arrivé en haut ou en bas de l’aperçu en le faisant défiler, la fenêtre se décale
+PREVIEW_WINDOW_MIN_CHARS = 50_000
+PREVIEW_WINDOW_LINES = 200
+
+def _preview_window(lines: list[str], center: int) -> tuple[int, int]:
+    """
+    Lignes [début, fin) à rendre autour de center, bornées par des lignes vides
+    hors bloc de code : on ne coupe ni paragraphe, ni liste, ni bloc ```.
+    """
+    lo = center - PREVIEW_WINDOW_LINES
+    hi = center + PREVIEW_WINDOW_LINES
+    start, end = 0, len(lines)
+    in_code = False
+    for i, line in enumerate(lines):
+        if "```" in line and line.lstrip().startswith("```"):
+            in_code = not in_code
+        elif not in_code and not line.strip():
+            if i <= lo:
+                start = i + 1
+            elif i >= hi:
+                end = i
+                break
+    return start, end
+
+# selectedText() -> toPlainText() : séparateurs de paragraphe/ligne et espace insécable
+PLAIN_TEXT_MAP = str.maketrans({"\u2029": "\n", "\u2028": "\n", "\xa0": " "})
+
+def _selected_text(cursor: QTextCursor) -> str:
+    """
+    Texte sélectionné avec des \\n, comme toPlainText() : Qt met U+2029 entre
+    les paragraphes et U+2028 pour les retours à la ligne internes.
+    """
+    # Sélection sur une seule ligne (cas courant) : un test « in » (memchr) et
+    # aucun appel à replace ; translate() passerait par la table caractère par caractère
+    text = cursor.selectedText()
+    if "\u2029" in text:
+        text = text.replace("\u2029", "\n")
+    if "\u2028" in text:
+        text = text.replace("\u2028", "\n")
+    return text
+
 class PreviewEdit(QTextEdit):
     """
     Aperçu rendu MAIS éditable (pour couper/copier/coller facilement).
     La mise à jour depuis le Markdown est suspendue quand le focus est à droite,
     pour ne pas écraser tes collages.
     """
+    focused_in = Signal()   # émis avant le traitement Qt du focus
+    focused_out = Signal()  # émis après
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.on_focus_in = None
-        self.on_focus_out = None
 
         self.setTextInteractionFlags(
             Qt.TextEditorInteraction | Qt.TextSelectableByMouse | Qt.LinksAccessibleByMouse
         )
 
     def focusInEvent(self, event):
-        if callable(self.on_focus_in):
-            self.on_focus_in()
+        self.focused_in.emit()
         super().focusInEvent(event)
 
     def focusOutEvent(self, event):
         super().focusOutEvent(event)
-        if callable(self.on_focus_out):
-            self.on_focus_out()
+        self.focused_out.emit()
+
+
+def _atomic_write_bytes(target: Path, data: bytes):
+    """
+    Écriture atomique via QSaveFile : fichier temporaire voisin (nom unique),
+    synchronisé sur disque puis renommé sur la cible par commit(). Un plantage
+    pendant l’écriture ne laisse jamais la cible tronquée ; les droits de la
+    cible sont conservés et un lien symbolique reste un lien.
+    Utilisable depuis un worker (pas d’objet parent).
+    """
+    f = QSaveFile(str(target))
+    if not f.open(QIODevice.WriteOnly):
+        raise OSError(f.errorString())
+    if f.write(data) != len(data):
+        err = f.errorString()
+        f.cancelWriting()
+        f.commit()  # abandonne le fichier temporaire, la cible n’est pas touchée
+        raise OSError(err)
+    if not f.commit():
+        raise OSError(f.errorString())
+
+
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, taille) du fichier, None s’il n’existe pas."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _AutosaveNotifier(QObject):
+    # Message d’erreur, ou "" si l’écriture a réussi (reçu dans le thread GUI)
+    finished = Signal(str)
+
+
+class _AutosaveJob(QRunnable):
+    """
+    Écriture d’autosave hors du thread GUI.
+    Le texte est déjà encodé (bytes) : le worker ne touche à aucun objet Qt/éditeur.
+    """
+    def __init__(self, data: bytes, target: Path, notifier: _AutosaveNotifier):
+        super().__init__()
+        self.data = data
+        self.target = target
+        self.notifier = notifier
+
+    def run(self):
+        try:
+            _atomic_write_bytes(self.target, self.data)
+        except Exception as e:
+            self.notifier.finished.emit(str(e))
+        else:
+            self.notifier.finished.emit("")
+
+
+class _ExportNotifier(QObject):
+    # (nom du fichier, message d’erreur ou "", dépendance manquante)
+    finished = Signal(str, str, bool)
+
+
+class _DocxExportJob(QRunnable):
+    """
+    Export DOCX (python-docx + lxml, pur Python) hors du thread GUI.
+    Le Markdown est une copie (str) : le worker ne touche à aucun objet Qt.
+    """
+    def __init__(self, md: str, out: Path, notifier: _ExportNotifier):
+        super().__init__()
+        self.md = md
+        self.out = out
+        self.notifier = notifier
+
+    def run(self):
+        error, missing = "", False
+        try:
+            export_docx_from_markdown(self.md, self.out)
+        except ModuleNotFoundError:
+            missing = True
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self.notifier.finished.emit(self.out.name, error, missing)
+
+
+class _PdfExportJob(QRunnable):
+    """
+    Export PDF (mise en page + impression) hors du thread GUI. Le QTextDocument
+    est créé dans le worker : un document de l’interface (l’aperçu) ne peut pas
+    être partagé entre threads.
+    """
+    def __init__(self, md: str, font: QFont, out: Path, notifier: _ExportNotifier):
+        super().__init__()
+        self.md = md
+        self.font = font
+        self.out = out
+        self.notifier = notifier
+
+    def run(self):
+        error = ""
+        try:
+            # QtPrintSupport n’est chargé qu’au premier export PDF ; dans le try :
+            # le signal part toujours (avec l’erreur), la file d’exports se vide
+            from PySide6.QtPrintSupport import QPrinter
+
+            doc = QTextDocument()
+            doc.setDefaultFont(self.font)
+            doc.setMarkdown(self.md)
+
+            printer = QPrinter(QPrinter.HighResolution)
+            printer.setOutputFormat(QPrinter.PdfFormat)
+            printer.setOutputFileName(str(self.out))
+            doc.print_(printer)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self.notifier.finished.emit(self.out.name, error, False)
+
+
+def _run_pandoc_html(cmd: list[str], data: bytes) -> str:
+    """Lance Pandoc (Markdown UTF-8 -> HTML) ; lève RuntimeError si pandoc échoue."""
+    import subprocess
+
+    proc = subprocess.run(
+        cmd,
+        input=data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False
+    )
+    if proc.returncode != 0:
+        err = proc.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(err)
+
+    return proc.stdout.decode("utf-8", errors="replace")
+
+
+# Nombre de rendus HTML Pandoc gardés pour l’aperçu (annuler/rétablir, allers-retours)
+PANDOC_HTML_CACHE_SIZE = 8
+# Fermeture de la fenêtre : attente maximale des exports Pandoc avant de demander
+PANDOC_CLOSE_WAIT_MS = 5000
+
+class _PandocRenderNotifier(QObject):
+    # (génération, HTML, message d’erreur ou "", durée en ms) reçu dans le thread GUI
+    finished = Signal(int, str, str, float)
+
+
+class _PandocRenderJob(QRunnable):
+    """
+    Aperçu Pandoc hors du thread GUI : la commande et le texte (bytes) sont
+    préparés avant, le worker ne fait que lancer le processus.
+    """
+    def __init__(self, cmd: list[str], data: bytes, generation: int, notifier: _PandocRenderNotifier):
+        super().__init__()
+        self.cmd = cmd
+        self.data = data
+        self.generation = generation
+        self.notifier = notifier
+
+    def run(self):
+        t0 = time.perf_counter()
+        try:
+            html, error = _run_pandoc_html(self.cmd, self.data), ""
+        except Exception as e:
+            html, error = "", str(e) or e.__class__.__name__
+        self.notifier.finished.emit(self.generation, html, error, (time.perf_counter() - t0) * 1000)
 
 
 @dataclass
 class AutosaveConfig:
     enabled: bool = True
     idle_ms: int = 1000            # autosave 1s après la dernière frappe
+    max_wait_ms: int = 10000       # frappe continue : autosave au moins toutes les 10 s
+    max_backoff_ms: int = 30000    # échecs répétés : délai doublé à chaque fois, jusqu’à 30 s
     use_main_file_if_possible: bool = True  # si un fichier est ouvert/sauvé, autosave dessus
     fallback_filename: str = "MiniMarkdown_autosave.md"  # si aucun fichier courant
 
 
 class MainWindow(QMainWindow):
+    # Gabarits d’insertion : texte à sélectionner (début, fin) dans le gabarit
+    _IMG_TEMPLATE = "![alt](https://)"
+    _IMG_ALT_START, _IMG_ALT_END = 2, 5
+    _LINK_TEMPLATE = "[texte](https://)"
+    _LINK_TEXT_START, _LINK_TEXT_END = 1, 6
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Mini Markdown — split editor")
 
         self.current_path: Path | None = None
         self.cfg = AutosaveConfig()
+        # Dernier dossier utilisé dans un dialogue de fichier (ouverture, enregistrement, export)
+        self._last_dir = str(Path.home())
 
         self.pandoc_path = self._find_pandoc()
         self.has_pandoc = self.pandoc_path is not None
@@ -199,6 +806,7 @@ class MainWindow(QMainWindow):
         mono.setStyleHint(QFont.Monospace)
         mono.setPointSize(11)
         self.editor.setFont(mono)
+        self.highlighter = MarkdownHighlighter(self.editor.document())
         self.preview.document().setDefaultFont(QFont("Arial", 11))
 
         # Split
@@ -207,28 +815,127 @@ class MainWindow(QMainWindow):
         splitter.addWidget(self.preview)
         splitter.setSizes([650, 650])
         self.setCentralWidget(splitter)
+        # Aperçu replié puis rouvert : on rattrape le rendu différé
+        splitter.splitterMoved.connect(lambda *_: self._flush_pending_render())
 
         # Render suspend pendant édition à droite
         self._suspend_render = False
         self._pending_render = False
-        self.preview.on_focus_in = self._preview_focus_in
-        self.preview.on_focus_out = self._preview_focus_out
-
-        # Timers : rendu + autosave
-        self._render_timer = QTimer(self)
-        self._render_timer.setSingleShot(True)
-        self._render_timer.setInterval(120)
-        self._render_timer.timeout.connect(self._render_preview_now)
-
-        self._autosave_timer = QTimer(self)
-        self._autosave_timer.setSingleShot(True)
-        self._autosave_timer.setInterval(self.cfg.idle_ms)
-        self._autosave_timer.timeout.connect(self._autosave_now)
+        # Rendu forcé (changement de mode, ouverture…) différé : il restera forcé
+        self._pending_force = False
+        self.preview.focused_in.connect(self._preview_focus_in)
+        self.preview.focused_out.connect(self._preview_focus_out)
+
+        # Aperçu incrémental : segments du dernier rendu + nb de blocs Qt par segment
+        self._preview_segments: list[str] | None = None
+        self._preview_block_counts: list[int] | None = None
+        # Nb de blocs par texte de segment, gardé d’un rendu complet à l’autre (même police)
+        self._segment_count_memo: dict[str, int | None] = {}
+        self._segment_count_font = ""
+        self._preview_revision = -1
+        self._last_rendered_md: str | None = None   # Markdown affiché par le rendu Qt
+
+        # Un seul timer pour le travail différé (rendu puis autosave), armé sur
+        # l’échéance la plus proche ; chaque tâche garde son échéance (time.monotonic)
+        self._work_timer = QTimer(self)
+        self._work_timer.setSingleShot(True)
+        # Timer grossier : peut tomber jusqu’à 5 % en avance, avant l’échéance => réveil pour rien
+        self._work_timer.setTimerType(Qt.PreciseTimer)
+        self._work_timer.timeout.connect(self._do_pending_work)
+        self._work_armed_at: float | None = None   # échéance sur laquelle le timer est armé
+        self._render_interval_ms = 120
+        self._render_due: float | None = None
+        # Rendu calé sur la prochaine image de la fenêtre (QWindow.requestUpdate)
+        self._frame_render_pending = False
+        self._frame_filter_installed = False
+        # Debounce adaptatif : relances du timer depuis le dernier rendu, durée du dernier rendu
+        self._render_restart_count = 0
+        self._last_render_ms = 0.0
+
+        # Aperçu Pandoc en arrière-plan : génération du rendu demandé en dernier
+        self._render_pool = QThreadPool(self)
+        self._render_pool.setMaxThreadCount(1)
+        self._pandoc_notifier = _PandocRenderNotifier(self)
+        self._pandoc_notifier.finished.connect(self._on_pandoc_rendered)
+        self._render_generation = 0
+        # ((hash, commande) du rendu en cours) ; derniers HTML Pandoc, du plus ancien au plus récent
+        self._pandoc_render_key: tuple[tuple[int, int], tuple[str, ...]] | None = None
+        self._pandoc_html_cache: OrderedDict[tuple[tuple[int, int], tuple[str, ...]], str] = OrderedDict()
+
+        # Autosave : échéance repoussée à chaque frappe ; début des changements
+        # pas encore autosauvés (plafond max_wait_ms)
+        self._autosave_pending = False
+        self._autosave_deadline = 0.0
+        self._autosave_since: float | None = None
+
+        # Écritures d’autosave : un seul thread, donc jamais deux écritures simultanées
+        self._autosave_pool = QThreadPool(self)
+        self._autosave_pool.setMaxThreadCount(1)
+        self._autosave_notifier = _AutosaveNotifier(self)
+        self._autosave_notifier.finished.connect(self._on_autosave_finished)
+        self._autosave_running: tuple[int, tuple[int, int], Path] | None = None  # (révision, hash, cible)
+        self._autosave_again = False
+        # Échecs d’écriture consécutifs (délai croissant) ; dossier cible dont on a vérifié les droits
+        self._autosave_fail_count = 0
+        self._autosave_checked_dir: Path | None = None
+
+        # Exports Pandoc en cours (QProcess, voir _run_pandoc_async)
+        self._pandoc_jobs: set[QProcess] = set()
+        # Exports DOCX (python-docx) et PDF : un seul thread, exports traités dans l’ordre
+        self._export_pool = QThreadPool(self)
+        self._export_pool.setMaxThreadCount(1)
+        self._docx_notifier = _ExportNotifier(self)
+        self._docx_notifier.finished.connect(self._on_docx_exported)
+        # Exports DOCX/PDF en file, dans l’ordre : (sortie, clé) ; derniers exports
+        # réussis par fichier : clé (hash du texte, police) et (mtime_ns, taille) écrits
+        self._docx_queued: list[tuple[Path, tuple]] = []
+        self._pdf_queued: list[tuple[Path, tuple]] = []
+        self._last_exports: dict[Path, tuple[tuple, tuple[int, int]]] = {}
+        # Dernier enregistrement : (fichier, hash du texte, (mtime_ns, taille))
+        self._last_saved: tuple[Path, tuple[int, int], tuple[int, int] | None] | None = None
+        self._pdf_notifier = _ExportNotifier(self)
+        self._pdf_notifier.finished.connect(self._on_pdf_exported)
+
+        # Longueur du texte et compteur de modifications (jamais réutilisé, même si
+        # le texte revient à l’identique), tenus à jour par contentsChange
+        self._content_len = 0
+        self._text_rev = 0
+        # Dernière copie du texte + changements à y rejouer (voir _plain_text)
+        self._text_cache: str | None = None
+        self._text_pending: list[tuple[int, int, str]] = []
+        self._text_splice_ok = False
+        # Dernier encodage UTF-8 (révision, octets), partagé par save/autosave/Pandoc
+        self._utf8_cache: tuple[int, bytes] | None = None
+        # Dernier hash de contenu (révision, hash), partagé par rendu/autosave/save
+        self._hash_cache: tuple[int, tuple[int, int]] | None = None
 
         self._dirty = False
-        self._last_autosaved_hash = None
-
-        self.editor.textChanged.connect(self._on_text_changed)
+        self._last_autosaved_rev: int | None = None
+        # Hash du contenu (voir _content_hash) au dernier autosave / dernier rendu
+        self._last_autosaved_hash: tuple[int, int] | None = None
+        # (hash, révision aperçu, ligne centrale de l’aperçu partiel ou None,
+        # moteur de rendu : "qt" ou "pandoc")
+        self._last_render_key: tuple[tuple[int, int], int, int | None, str] | None = None
+        # Gros document : ligne de l’éditeur autour de laquelle l’aperçu est rendu
+        self._preview_anchor: int | None = None
+        # Ligne centrale posée par le défilement de l’aperçu : elle ne suit plus le
+        # curseur jusqu’à son prochain mouvement
+        self._preview_anchor_scrolled = False
+        # Aperçu partiel affiché : lignes [début, fin) et nombre total de lignes
+        self._preview_window_lines: tuple[int, int, int] | None = None
+        # Ligne à garder en vue au prochain rendu partiel (ligne, en bas de la vue ?)
+        self._preview_scroll_keep: tuple[int, bool] | None = None
+        # Document d’export hors aperçu, créé une fois et réécrit ; texte qu’il
+        # contient (None : à refaire, le texte a changé depuis)
+        self._export_scratch_doc: QTextDocument | None = None
+        self._export_scratch_md: str | None = None
+
+        # contentsChange seul : émis uniquement pour un vrai changement, avec sa position
+        self.editor.document().contentsChange.connect(self._on_contents_change)
+        self.editor.cursorPositionChanged.connect(self._on_editor_cursor_moved)
+        # Défilement de l’aperçu, y compris molette/flèches déjà en butée (sans valueChanged)
+        self.preview.verticalScrollBar().valueChanged.connect(self._on_preview_scrolled)
+        self.preview.verticalScrollBar().actionTriggered.connect(self._on_preview_scrolled)
 
         # Menus
         self._build_actions()
@@ -251,8 +958,40 @@ class MainWindow(QMainWindow):
             "À droite : tu peux aussi couper/copier/coller (tampon),\n"
             "mais ce que tu y modifies n’est pas réinjecté dans le Markdown.\n"
         )
+        self._settle_loaded_text()
         self._render_preview_now(force=True)
 
+    def _settle_loaded_text(self):
+        """
+        Texte posé par programme (accueil, ouverture de fichier) : pas une
+        modification de l’utilisateur. contentsChange reste connecté (révision,
+        copie du texte), mais on annule ce qu’il a déclenché : document
+        « modifié », rendu différé (l’appelant rend une fois), autosave à venir.
+        Le texte posé compte comme déjà autosauvé (révision de référence).
+        """
+        self._dirty = False
+        self._last_autosaved_rev = self._text_rev
+        self._render_due = None
+        self._frame_render_pending = False
+        self._autosave_pending = False
+        self._autosave_since = None
+        self._work_timer.stop()
+        self._work_armed_at = None
+
+    def recheck_pandoc(self):
+        """Nouvelle détection de pandoc (installé ou PANDOC_PATH changé depuis le lancement)."""
+        self.pandoc_path = self._find_pandoc()
+        self.has_pandoc = self.pandoc_path is not None
+        for act in self._pandoc_actions:
+            act.setEnabled(self.has_pandoc)
+        if not self.has_pandoc and self.pandoc_preview_enabled:
+            self.act_pandoc_preview.setChecked(False)
+            self.toggle_pandoc_preview(False)
+        self._update_pandoc_indicator()
+        self.statusBar().showMessage(
+            f"Pandoc trouvé : {self.pandoc_path}" if self.has_pandoc else "Pandoc introuvable", 2500
+        )
+
     def _update_pandoc_indicator(self):
         if self.has_pandoc:
             self.pandoc_label.setText("Pandoc installé")
@@ -272,8 +1011,8 @@ class MainWindow(QMainWindow):
             )
 
     def choose_bib(self):
-        path, _ = QFileDialog.getOpenFileName(
-            self, "Choisir un fichier BibTeX", "", "BibTeX (*.bib);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getOpenFileName, "Choisir un fichier BibTeX", "BibTeX (*.bib);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -290,8 +1029,8 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(".bib oublié", 1500)
 
     def choose_csl(self):
-        path, _ = QFileDialog.getOpenFileName(
-            self, "Choisir un fichier CSL (style de citation)", "", "CSL (*.csl);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getOpenFileName, "Choisir un fichier CSL (style de citation)", "CSL (*.csl);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -348,27 +1087,21 @@ class MainWindow(QMainWindow):
         act_export_docx.triggered.connect(self.export_docx)
 
         self.act_export_docx_pandoc = QAction("Exporter en DOCX (Pandoc)…", self)
-        self.act_export_docx_pandoc.setEnabled(self.has_pandoc)
         self.act_export_docx_pandoc.triggered.connect(self.export_docx_pandoc)
 
         self.act_export_html_pandoc = QAction("Exporter en HTML (Pandoc)…", self)
-        self.act_export_html_pandoc.setEnabled(self.has_pandoc)
         self.act_export_html_pandoc.triggered.connect(self.export_html_pandoc)
 
         self.act_export_pdf_pandoc = QAction("Exporter en PDF (Pandoc)…", self)
-        self.act_export_pdf_pandoc.setEnabled(self.has_pandoc)
         self.act_export_pdf_pandoc.triggered.connect(self.export_pdf_pandoc)
 
         self.act_export_tex_pandoc = QAction("Exporter en LaTeX (Pandoc)…", self)
-        self.act_export_tex_pandoc.setEnabled(self.has_pandoc)
         self.act_export_tex_pandoc.triggered.connect(self.export_tex_pandoc)
 
         self.act_export_odt_pandoc = QAction("Exporter en ODT (Pandoc)…", self)
-        self.act_export_odt_pandoc.setEnabled(self.has_pandoc)
         self.act_export_odt_pandoc.triggered.connect(self.export_odt_pandoc)
 
         self.act_export_epub_pandoc = QAction("Exporter en EPUB (Pandoc)…", self)
-        self.act_export_epub_pandoc.setEnabled(self.has_pandoc)
         self.act_export_epub_pandoc.triggered.connect(self.export_epub_pandoc)
 
 
@@ -384,6 +1117,10 @@ class MainWindow(QMainWindow):
         m_export.addAction(self.act_export_tex_pandoc)
         m_export.addAction(self.act_export_odt_pandoc)
         m_export.addAction(self.act_export_epub_pandoc)
+        m_export.addSeparator()
+        act_recheck_pandoc = QAction("Rechercher Pandoc à nouveau", self)
+        act_recheck_pandoc.triggered.connect(self.recheck_pandoc)
+        m_export.addAction(act_recheck_pandoc)
 
         # Références (Pandoc)
         m_refs = self.menuBar().addMenu("Références")
@@ -391,23 +1128,18 @@ class MainWindow(QMainWindow):
         self.act_citeproc = QAction("Activer citations + bibliographie (Pandoc)", self)
         self.act_citeproc.setCheckable(True)
         self.act_citeproc.setChecked(self.citeproc_enabled)
-        self.act_citeproc.setEnabled(self.has_pandoc)
         self.act_citeproc.triggered.connect(self.toggle_citeproc)
 
         act_choose_bib = QAction("Choisir un fichier .bib…", self)
-        act_choose_bib.setEnabled(self.has_pandoc)
         act_choose_bib.triggered.connect(self.choose_bib)
 
         act_clear_bib = QAction("Oublier le .bib", self)
-        act_clear_bib.setEnabled(self.has_pandoc)
         act_clear_bib.triggered.connect(self.clear_bib)
 
         act_choose_csl = QAction("Choisir un style .csl… (optionnel)", self)
-        act_choose_csl.setEnabled(self.has_pandoc)
         act_choose_csl.triggered.connect(self.choose_csl)
 
         act_clear_csl = QAction("Oublier le .csl", self)
-        act_clear_csl.setEnabled(self.has_pandoc)
         act_clear_csl.triggered.connect(self.clear_csl)
 
         m_refs.addAction(self.act_citeproc)
@@ -424,7 +1156,6 @@ class MainWindow(QMainWindow):
         self.act_pandoc_preview = QAction("Aperçu Pandoc (meilleur rendu : notes, biblio…)", self)
         self.act_pandoc_preview.setCheckable(True)
         self.act_pandoc_preview.setChecked(self.pandoc_preview_enabled)
-        self.act_pandoc_preview.setEnabled(self.has_pandoc)
         self.act_pandoc_preview.triggered.connect(self.toggle_pandoc_preview)
 
         m_view.addAction(self.act_pandoc_preview)
@@ -449,6 +1180,16 @@ class MainWindow(QMainWindow):
         m_edit.addAction(act_copy)
         m_edit.addAction(act_paste)
 
+        # Actions qui demandent Pandoc (activées/désactivées ensemble)
+        self._pandoc_actions = (
+            self.act_export_docx_pandoc, self.act_export_html_pandoc, self.act_export_pdf_pandoc,
+            self.act_export_tex_pandoc, self.act_export_odt_pandoc, self.act_export_epub_pandoc,
+            self.act_citeproc, act_choose_bib, act_clear_bib, act_choose_csl, act_clear_csl,
+            self.act_pandoc_preview,
+        )
+        for act in self._pandoc_actions:
+            act.setEnabled(self.has_pandoc)
+
     def _append_pandoc_citeproc_args(self, cmd: list[str], warn: bool = True) -> list[str]:
         """
         Ajoute --citeproc / --bibliography / --csl si activés et valides.
@@ -474,13 +1215,52 @@ class MainWindow(QMainWindow):
 
         return cmd
 
+    def _run_pandoc_async(self, cmd: list[str], data: bytes, on_done):
+        """
+        Lance Pandoc via QProcess (l’interface reste utilisable pendant l’export) ;
+        on_done(erreur) est appelé à la fin, avec "" si tout s’est bien passé.
+        """
+        proc = QProcess(self)
+        proc.setProgram(cmd[0])
+        proc.setArguments(cmd[1:])
+        self._pandoc_jobs.add(proc)
+
+        def finish(error: str):
+            if proc not in self._pandoc_jobs:
+                return  # errorOccurred puis finished : un seul rapport
+            self._pandoc_jobs.discard(proc)
+            proc.deleteLater()
+            if error:
+                # Remplace « Export Pandoc en cours… » avant la boîte d’erreur
+                self.statusBar().showMessage("Export Pandoc échoué.", 2500)
+            on_done(error)
+
+        def finished(code: int, status):
+            if status != QProcess.NormalExit or code != 0:
+                err = bytes(proc.readAllStandardError()).decode("utf-8", errors="replace").strip()
+                finish(err or f"Pandoc s’est terminé avec le code {code}.")
+            else:
+                finish("")
+
+        def error_occurred(err):
+            if err == QProcess.FailedToStart:
+                finish(f"Impossible de lancer Pandoc : {proc.errorString()}")
+
+        proc.finished.connect(finished)
+        proc.errorOccurred.connect(error_occurred)
+        proc.start()
+        # Écrit dans le tampon de QProcess, transmis à pandoc dès son démarrage
+        proc.write(data)
+        proc.closeWriteChannel()
+        self.statusBar().showMessage("Export Pandoc en cours…")
+
     def export_html_pandoc(self):
         if not self.has_pandoc:
             QMessageBox.information(self, "Pandoc", "Pandoc n’est pas disponible.")
             return
 
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter en HTML (Pandoc)", "", "HTML (*.html);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Exporter en HTML (Pandoc)", "HTML (*.html);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -489,38 +1269,35 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != ".html":
             out = out.with_suffix(".html")
 
-        md = self.editor.toPlainText()
-
-        try:
-            import subprocess
-
-            cmd = [
-                self.pandoc_path,
-                "--from", "markdown",
-                "--standalone",
-                "--output", str(out),
-            ]
+        data = self._utf8_bytes()
 
-            # Optionnel : choisir un moteur PDF (si installé)
-            # cmd.append("--pdf-engine=xelatex")  # ou lualatex / pdflatex
+        cmd = [
+            self.pandoc_path,
+            "--from", "markdown",
+            "--standalone",
+            "--output", str(out),
+        ]
 
-            cmd = self._append_pandoc_citeproc_args(cmd)
+        # Optionnel : choisir un moteur PDF (si installé)
+        # cmd.append("--pdf-engine=xelatex")  # ou lualatex / pdflatex
 
-            subprocess.run(cmd, input=md.encode("utf-8"), check=True)
+        cmd = self._append_pandoc_citeproc_args(cmd)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur export HTML (Pandoc)", str(e))
-            return
+        def done(error: str):
+            if error:
+                QMessageBox.critical(self, "Erreur export HTML (Pandoc)", error)
+                return
+            self.statusBar().showMessage(f"Export HTML (Pandoc) : {out.name}", 1500)
 
-        self.statusBar().showMessage(f"Export HTML (Pandoc) : {out.name}", 1500)
+        self._run_pandoc_async(cmd, data, done)
 
     def export_pdf_pandoc(self):
         if not self.has_pandoc:
             QMessageBox.information(self, "Pandoc", "Pandoc n’est pas disponible.")
             return
 
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter en PDF (Pandoc)", "", "PDF (*.pdf);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Exporter en PDF (Pandoc)", "PDF (*.pdf);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -529,42 +1306,39 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != ".pdf":
             out = out.with_suffix(".pdf")
 
-        md = self.editor.toPlainText()
-
-        try:
-            import subprocess
+        data = self._utf8_bytes()
 
-            cmd = [
-                self.pandoc_path,
-                "--from", "markdown",
-                "--to", "pdf",
-                "--standalone",
-                "--output", str(out),
-            ]
-
-            # Optionnel : si tu veux forcer un moteur PDF (à installer sur la machine)
-            # cmd.append("--pdf-engine=xelatex")
+        cmd = [
+            self.pandoc_path,
+            "--from", "markdown",
+            "--to", "pdf",
+            "--standalone",
+            "--output", str(out),
+        ]
 
-            cmd = self._append_pandoc_citeproc_args(cmd)
+        # Optionnel : si tu veux forcer un moteur PDF (à installer sur la machine)
+        # cmd.append("--pdf-engine=xelatex")
 
-            subprocess.run(cmd, input=md.encode("utf-8"), check=True)
+        cmd = self._append_pandoc_citeproc_args(cmd)
 
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Erreur export PDF (Pandoc)",
-                str(e) + "\n\n"
-                         "Note : l’export PDF via Pandoc nécessite généralement un moteur LaTeX (TeX Live / MiKTeX)."
-            )
-            return
+        def done(error: str):
+            if error:
+                QMessageBox.critical(
+                    self, "Erreur export PDF (Pandoc)",
+                    error + "\n\n"
+                            "Note : l’export PDF via Pandoc nécessite généralement un moteur LaTeX (TeX Live / MiKTeX)."
+                )
+                return
+            self.statusBar().showMessage(f"Export PDF (Pandoc) : {out.name}", 1500)
 
-        self.statusBar().showMessage(f"Export PDF (Pandoc) : {out.name}", 1500)
+        self._run_pandoc_async(cmd, data, done)
 
     def export_with_pandoc(self, to_format: str, dialog_title: str, filter_str: str, default_suffix: str):
         if not self.has_pandoc:
             QMessageBox.information(self, "Pandoc", "Pandoc n’est pas disponible.")
             return
 
-        path, _ = QFileDialog.getSaveFileName(self, dialog_title, "", filter_str)
+        path = self._ask_path(QFileDialog.getSaveFileName, dialog_title, filter_str)
         if not path:
             return
 
@@ -572,35 +1346,32 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != default_suffix:
             out = out.with_suffix(default_suffix)
 
-        md = self.editor.toPlainText()
+        data = self._utf8_bytes()
 
-        try:
-            import subprocess
-
-            cmd = [
-                self.pandoc_path,
-                "--from", "markdown",
-                "--to", to_format,
-                "--standalone",
-                "--output", str(out),
-            ]
-
-            # Biblio/citations si activé
-            cmd = self._append_pandoc_citeproc_args(cmd)
+        cmd = [
+            self.pandoc_path,
+            "--from", "markdown",
+            "--to", to_format,
+            "--standalone",
+            "--output", str(out),
+        ]
 
-            # Styles Word optionnels pour DOCX seulement
-            if to_format == "docx" and self.current_path:
-                ref = self.current_path.parent / "reference.docx"
-                if ref.exists():
-                    cmd.append(f"--reference-doc={ref}")
+        # Biblio/citations si activé
+        cmd = self._append_pandoc_citeproc_args(cmd)
 
-            subprocess.run(cmd, input=md.encode("utf-8"), check=True)
+        # Styles Word optionnels pour DOCX seulement
+        if to_format == "docx" and self.current_path:
+            ref = self.current_path.parent / "reference.docx"
+            if ref.exists():
+                cmd.append(f"--reference-doc={ref}")
 
-        except Exception as e:
-            QMessageBox.critical(self, f"Erreur export ({to_format})", str(e))
-            return
+        def done(error: str):
+            if error:
+                QMessageBox.critical(self, f"Erreur export ({to_format})", error)
+                return
+            self.statusBar().showMessage(f"Export Pandoc ({to_format}) : {out.name}", 1500)
 
-        self.statusBar().showMessage(f"Export Pandoc ({to_format}) : {out.name}", 1500)
+        self._run_pandoc_async(cmd, data, done)
 
     def export_tex_pandoc(self):
         self.export_with_pandoc(
@@ -635,8 +1406,8 @@ class MainWindow(QMainWindow):
             )
             return
 
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter en DOCX (Pandoc)", "", "Word (*.docx);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Exporter en DOCX (Pandoc)", "Word (*.docx);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -645,35 +1416,32 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != ".docx":
             out = out.with_suffix(".docx")
 
-        md = self.editor.toPlainText()
-
-        try:
-            import subprocess
-
-            cmd = [
-                self.pandoc_path,
-                "--from", "markdown",
-                "--to", "docx",
-                "--output", str(out),
-                "--standalone",
-            ]
+        data = self._utf8_bytes()
 
-            # Option : styles Word si reference.docx à côté du .md
-            if self.current_path:
-                ref = self.current_path.parent / "reference.docx"
-                if ref.exists():
-                    cmd.append(f"--reference-doc={ref}")
+        cmd = [
+            self.pandoc_path,
+            "--from", "markdown",
+            "--to", "docx",
+            "--output", str(out),
+            "--standalone",
+        ]
 
-            # Bibliographie / citations (Pandoc)
-            cmd = self._append_pandoc_citeproc_args(cmd)
+        # Option : styles Word si reference.docx à côté du .md
+        if self.current_path:
+            ref = self.current_path.parent / "reference.docx"
+            if ref.exists():
+                cmd.append(f"--reference-doc={ref}")
 
-            subprocess.run(cmd, input=md.encode("utf-8"), check=True)
+        # Bibliographie / citations (Pandoc)
+        cmd = self._append_pandoc_citeproc_args(cmd)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur export DOCX (Pandoc)", str(e))
-            return
+        def done(error: str):
+            if error:
+                QMessageBox.critical(self, "Erreur export DOCX (Pandoc)", error)
+                return
+            self.statusBar().showMessage(f"Export DOCX (Pandoc) : {out.name}", 1500)
 
-        self.statusBar().showMessage(f"Export DOCX (Pandoc) : {out.name}", 1500)
+        self._run_pandoc_async(cmd, data, done)
 
 
     def _find_pandoc(self) -> str | None:
@@ -794,9 +1562,7 @@ class MainWindow(QMainWindow):
         cursor = ed.textCursor()
 
         if cursor.hasSelection():
-            selected = cursor.selectedText()
-            # Qt met parfois des séparateurs Unicode pour les retours ligne en sélection
-            selected = selected.replace("\u2029", "\n")
+            selected = _selected_text(cursor)
             cursor.insertText(f"{left}{selected}{right}")
         else:
             # Insère les marqueurs et place le curseur au milieu
@@ -828,10 +1594,10 @@ class MainWindow(QMainWindow):
         cursor.setPosition(start_line)
         cursor.setPosition(end_line, QTextCursor.KeepAnchor)
 
-        block = cursor.selectedText().replace("\u2029", "\n")
-        lines = block.split("\n")
-        lines = [prefix + ln if ln.strip() else ln for ln in lines]
-        cursor.insertText("\n".join(lines))
+        block = _selected_text(cursor)
+        # isspace() teste les lignes blanches sans construire la copie strip()
+        cursor.insertText("\n".join([prefix + ln if ln and not ln.isspace() else ln
+                                      for ln in block.split("\n")]))
         ed.setFocus()
 
     def _toggle_code(self):
@@ -847,7 +1613,7 @@ class MainWindow(QMainWindow):
             self._wrap_selection("`", "`")
             return
 
-        selected = cursor.selectedText().replace("\u2029", "\n")
+        selected = _selected_text(cursor)
         if "\n" in selected:
             cursor.insertText(f"```\n{selected}\n```")
         else:
@@ -879,7 +1645,7 @@ class MainWindow(QMainWindow):
         cursor = ed.textCursor()
 
         if cursor.hasSelection():
-            selected = cursor.selectedText().replace("\u2029", "\n").strip("\n")
+            selected = _selected_text(cursor).strip("\n")
             lines = [ln for ln in selected.split("\n") if ln.strip()]
             # Tentative: chaque ligne "col1\tcol2"
             rows = []
@@ -915,21 +1681,22 @@ class MainWindow(QMainWindow):
         """
         Insère une image Markdown.
         - Si sélection : ![selection](url)
-        - Sinon : ![alt](url) avec curseur sur alt.
+        - Sinon : ![alt](url) avec alt sélectionné.
         """
         ed = self._active_editor()
         cursor = ed.textCursor()
 
         if cursor.hasSelection():
-            alt = cursor.selectedText().replace("\u2029", "\n")
+            alt = _selected_text(cursor)
             cursor.insertText(f"![{alt}](https://)")
             cursor.movePosition(QTextCursor.Left, QTextCursor.MoveAnchor, 1)
             ed.setTextCursor(cursor)
         else:
-            cursor.insertText("![alt](https://)")
-            # placer le curseur sur "alt"
-            cursor.movePosition(QTextCursor.Left, QTextCursor.MoveAnchor, len("](https://)"))
-            cursor.movePosition(QTextCursor.Left, QTextCursor.MoveAnchor, len("alt"))
+            start = cursor.selectionStart()
+            cursor.insertText(self._IMG_TEMPLATE)
+            # sélectionner "alt" : la frappe le remplace
+            cursor.setPosition(start + self._IMG_ALT_START)
+            cursor.setPosition(start + self._IMG_ALT_END, QTextCursor.KeepAnchor)
             ed.setTextCursor(cursor)
 
         ed.setFocus()
@@ -938,22 +1705,23 @@ class MainWindow(QMainWindow):
         """
         Insère un lien Markdown.
         - Si sélection : [selection](url)
-        - Sinon : [texte](url) avec curseur sur 'texte'
+        - Sinon : [texte](url) avec 'texte' sélectionné
         """
         ed = self._active_editor()
         cursor = ed.textCursor()
 
         if cursor.hasSelection():
-            text = cursor.selectedText().replace("\u2029", "\n")
+            text = _selected_text(cursor)
             cursor.insertText(f"[{text}](https://)")
             # placer le curseur après https:// pour saisir l'URL
             cursor.movePosition(QTextCursor.Left, QTextCursor.MoveAnchor, 1)
             ed.setTextCursor(cursor)
         else:
-            cursor.insertText("[texte](https://)")
-            # placer le curseur sur "texte"
-            cursor.movePosition(QTextCursor.Left, QTextCursor.MoveAnchor, len("](https://)"))
-            cursor.movePosition(QTextCursor.Left, QTextCursor.MoveAnchor, len("texte"))
+            start = cursor.selectionStart()
+            cursor.insertText(self._LINK_TEMPLATE)
+            # sélectionner "texte" : la frappe le remplace
+            cursor.setPosition(start + self._LINK_TEXT_START)
+            cursor.setPosition(start + self._LINK_TEXT_END, QTextCursor.KeepAnchor)
             ed.setTextCursor(cursor)
 
         ed.setFocus()
@@ -968,7 +1736,7 @@ class MainWindow(QMainWindow):
         cursor = ed.textCursor()
 
         if cursor.hasSelection():
-            selected = cursor.selectedText().replace("\u2029", "\n")
+            selected = _selected_text(cursor)
             cursor.insertText(f"^[{selected}]")
         else:
             cursor.insertText("^[...]")
@@ -981,12 +1749,14 @@ class MainWindow(QMainWindow):
     def toggle_autosave(self, checked: bool):
         self.cfg.enabled = checked
         if not checked:
-            self._autosave_timer.stop()
+            self._autosave_pending = False
+            self._autosave_since = None
             self.statusBar().showMessage("Autosave désactivé", 1200)
         else:
             self.statusBar().showMessage("Autosave activé", 1200)
-            if self._dirty:
-                self._autosave_timer.start(self.cfg.idle_ms)
+            if self._text_rev != self._last_autosaved_rev:
+                self._queue_autosave()
+        self._schedule_work()
 
     def _smart_cut(self):
         w = QApplication.focusWidget()
@@ -1013,20 +1783,212 @@ class MainWindow(QMainWindow):
         self._suspend_render = False
         if self._pending_render:
             self._pending_render = False
-            self._render_preview_now(force=True)
+            # Pas de force : clé de rendu (rien n’a changé ?) et patch incrémental
+            # restent valables ; un aperçu retouché est détecté par sa révision
+            self._render_preview_now()
+
+    def _preview_hidden(self) -> bool:
+        """Aperçu invisible : fenêtre réduite ou panneau replié dans le splitter."""
+        return self.isMinimized() or not self.preview.isVisible() or self.preview.width() < 4
+
+    def _flush_pending_render(self):
+        if self._pending_render and not self._suspend_render and not self._preview_hidden():
+            self._pending_render = False
+            self._render_preview_now()
+
+    def closeEvent(self, event):
+        # Exports en cours (pandoc, worker DOCX/PDF) : on les laisse finir plutôt
+        # que de laisser un fichier de sortie incomplet. Pandoc (processus externe,
+        # LaTeX…) peut rester bloqué : attente bornée, puis on demande.
+        deadline = time.monotonic() + PANDOC_CLOSE_WAIT_MS / 1000
+        for proc in list(self._pandoc_jobs):
+            proc.waitForFinished(max(0, round((deadline - time.monotonic()) * 1000)))
+        running = [proc for proc in self._pandoc_jobs if proc.state() != QProcess.NotRunning]
+        if running:
+            answer = QMessageBox.question(
+                self, "Pandoc",
+                "Un export Pandoc est toujours en cours.\n\n"
+                "L’interrompre et fermer ? (le fichier exporté sera incomplet)"
+            )
+            if answer != QMessageBox.Yes:
+                event.ignore()
+                return
+            for proc in running:
+                proc.blockSignals(True)  # pas de rapport d’erreur pendant la fermeture
+                proc.kill()
+                proc.waitForFinished(1000)
+        self._export_pool.waitForDone()
+        super().closeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        win = self.windowHandle()
+        if win is not None and not self._frame_filter_installed:
+            win.installEventFilter(self)
+            self._frame_filter_installed = True
+        QTimer.singleShot(0, self._flush_pending_render)
+
+    def _request_render_frame(self):
+        """
+        Fin du debounce : au lieu de rendre tout de suite (au milieu des
+        événements clavier en attente), on demande une image à la fenêtre et
+        on rend au début de celle-ci, juste avant que Qt ne repeigne.
+        """
+        win = self.windowHandle()
+        if win is None or not win.isExposed() or not self._frame_filter_installed:
+            self._render_preview_now()
+            return
+        self._frame_render_pending = True
+        win.requestUpdate()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.UpdateRequest and self._frame_render_pending:
+            self._frame_render_pending = False
+            self._render_preview_now()
+        return super().eventFilter(obj, event)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            QTimer.singleShot(0, self._flush_pending_render)
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """
+        Suivi incrémental : chaque modification incrémente la révision du texte
+        (clé des caches UTF-8 / hash) et est gardée pour être rejouée sur la copie
+        du texte. Coût O(taille du changement) par frappe.
+        """
+        if not removed and not added:
+            return
+        doc = self.editor.document()
+        cursor = QTextCursor(doc)
+        cursor.setPosition(position)
+        cursor.setPosition(min(position + added, doc.characterCount() - 1), QTextCursor.KeepAnchor)
+        added_text = cursor.selectedText()
+        self._content_len += added - removed
+        self._text_rev += 1
+
+        # Copie du texte : on garde le changement pour le rejouer (voir _plain_text)
+        if self._text_cache is not None:
+            if self._text_splice_ok and len(added_text) == added and len(self._text_pending) < 32:
+                self._text_pending.append((position, removed, added_text.translate(PLAIN_TEXT_MAP)))
+            else:
+                self._text_cache = None
+        self._on_text_changed()
+
+    def _plain_text(self) -> str:
+        """
+        Texte de l’éditeur (comme toPlainText). Les changements reçus depuis la
+        dernière copie sont rejoués dessus par découpage de chaînes, bien moins
+        cher qu’un toPlainText() complet sur un gros document.
+        """
+        if self._text_cache is None:
+            doc = self.editor.document()
+            text = doc.toPlainText()
+            # Positions Qt en unités UTF-16 : rejouer n’est sûr que sans caractère hors BMP
+            self._text_splice_ok = len(text) == doc.characterCount() - 1
+            self._text_cache = text
+            self._text_pending = []
+        elif self._text_pending:
+            text = self._text_cache
+            for pos, removed, added in self._text_pending:
+                text = text[:pos] + added + text[pos + removed:]
+            self._text_cache = text
+            self._text_pending = []
+        return self._text_cache
+
+    def _utf8_bytes(self) -> bytes:
+        """Texte encodé en UTF-8, réencodé seulement si le texte a été modifié."""
+        rev = self._text_rev
+        if self._utf8_cache is None or self._utf8_cache[0] != rev:
+            self._utf8_cache = (rev, self._plain_text().encode("utf-8"))
+        return self._utf8_cache[1]
+
+    def _content_hash(self) -> tuple[int, int]:
+        """
+        (longueur, CRC32) des octets UTF-8, calculé à la demande (rendu, autosave)
+        et non à chaque frappe. Contrairement à la révision, il ne dépend que du
+        texte : il redevient identique si le texte revient à l’identique.
+        """
+        rev = self._text_rev
+        if self._hash_cache is None or self._hash_cache[0] != rev:
+            data = self._utf8_bytes()
+            self._hash_cache = (rev, (len(data), zlib.crc32(data)))
+        return self._hash_cache[1]
 
     def _on_text_changed(self):
         self._dirty = True
+        self._export_scratch_md = None
 
         # rendu
         if self._suspend_render:
             self._pending_render = True
         else:
-            self._render_timer.start()
+            # Frappe soutenue : après quelques relances, on laisse le timer aller au bout
+            self._render_restart_count += 1
+            if not (self._render_due is not None and self._render_restart_count > 8):
+                self._render_due = time.monotonic() + self._render_interval_ms / 1000
 
-        # autosave
+        # autosave : on repousse l’échéance
         if self.cfg.enabled:
-            self._autosave_timer.start(self.cfg.idle_ms)
+            self._queue_autosave()
+        self._schedule_work()
+
+    def _queue_autosave(self):
+        now = time.monotonic()
+        self._autosave_deadline = now + self.cfg.idle_ms / 1000
+        if self._autosave_since is None:
+            self._autosave_since = now
+        self._autosave_pending = True
+
+    def _schedule_work(self):
+        """
+        Arme le timer unique sur l’échéance la plus proche (rendu, autosave).
+        Déjà armé sur une échéance antérieure (frappe : les échéances reculent) :
+        on le laisse courir, _do_pending_work réarmera sur la nouvelle.
+        """
+        dues = []
+        if self._render_due is not None:
+            dues.append(self._render_due)
+        if self._autosave_pending:
+            dues.append(self._autosave_due())
+        if not dues:
+            self._work_timer.stop()
+            self._work_armed_at = None
+            return
+        due = min(dues)
+        if self._work_timer.isActive() and self._work_armed_at is not None and self._work_armed_at <= due:
+            return
+        self._work_armed_at = due
+        self._work_timer.start(max(0, round((due - time.monotonic()) * 1000)))
+
+    def _autosave_due(self) -> float:
+        """Échéance de l’autosave : inactivité ou plafond, repoussée après des échecs."""
+        since = self._autosave_since if self._autosave_since is not None else self._autosave_deadline
+        due = min(self._autosave_deadline, since + self.cfg.max_wait_ms / 1000)
+        if self._autosave_fail_count:
+            backoff = self.cfg.idle_ms * 2 ** self._autosave_fail_count
+            due += min(backoff, self.cfg.max_backoff_ms) / 1000
+        return due
+
+    def _do_pending_work(self):
+        """Tâches arrivées à échéance, dans l’ordre : rendu de l’aperçu, puis autosave."""
+        self._work_armed_at = None
+        now = time.monotonic()
+        render_due = self._render_due is not None and self._render_due <= now
+        if render_due:
+            self._render_due = None
+            self._request_render_frame()
+        if self._autosave_pending:
+            if self._autosave_due() <= now:
+                if self._frame_render_pending and not render_due:
+                    # Rendu calé sur une image pas encore arrivée : on le fait d’abord
+                    self._frame_render_pending = False
+                    self._render_preview_now()
+                self._autosave_pending = False
+                self._autosave_since = None
+                self._autosave_now()
+        self._schedule_work()
 
     def toggle_pandoc_preview(self, checked: bool):
         self.pandoc_preview_enabled = checked
@@ -1043,13 +2005,8 @@ class MainWindow(QMainWindow):
         )
         self._render_preview_now(force=True)
 
-    def _pandoc_markdown_to_html(self, md: str) -> str:
-        """
-        Transforme Markdown -> HTML via Pandoc (pour l’aperçu).
-        Renvoie une chaîne HTML (peut lever exception si pandoc échoue).
-        """
-        import subprocess
-
+    def _pandoc_preview_cmd(self) -> list[str]:
+        """Commande Pandoc Markdown -> HTML pour l’aperçu (lue sur stdin)."""
         cmd = [
             self.pandoc_path,
             "--from", "markdown",
@@ -1058,47 +2015,357 @@ class MainWindow(QMainWindow):
         ]
 
         # Important : pas de popups à chaque frappe
-        cmd = self._append_pandoc_citeproc_args(cmd, warn=False)
-
-        proc = subprocess.run(
-            cmd,
-            input=md.encode("utf-8"),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=False
-        )
-        if proc.returncode != 0:
-            err = proc.stderr.decode("utf-8", errors="replace")
-            raise RuntimeError(err)
+        return self._append_pandoc_citeproc_args(cmd, warn=False)
+
+    def _start_pandoc_render(self, h: tuple[int, int]):
+        """Lance la conversion Pandoc en arrière-plan ; le résultat arrive dans _on_pandoc_rendered."""
+        self._render_generation += 1
+        cmd = self._pandoc_preview_cmd()
+        key = (h, tuple(cmd))
+        html = self._pandoc_html_cache.get(key)
+        if html is not None:
+            # Texte déjà rendu récemment (annuler/rétablir…) : pas de processus pandoc
+            self._pandoc_html_cache.move_to_end(key)
+            self._apply_pandoc_html(h, html)
+            return
+        self._pandoc_render_key = key
+        job = _PandocRenderJob(cmd, self._utf8_bytes(), self._render_generation, self._pandoc_notifier)
+        self._render_pool.start(job)
 
-        return proc.stdout.decode("utf-8", errors="replace")
+    def _apply_pandoc_html(self, h: tuple[int, int], html: str):
+        self.preview.blockSignals(True)
+        try:
+            self.preview.setHtml(html)
+        finally:
+            self.preview.blockSignals(False)
+        self._last_render_key = (h, self.preview.document().revision(), None, "pandoc")
+
+    def _on_pandoc_rendered(self, generation: int, html: str, error: str, ms: float):
+        # Résultat périmé (texte modifié ou mode changé depuis) : on l’ignore
+        if generation != self._render_generation or not self.pandoc_preview_enabled:
+            return
+        if self._suspend_render:
+            # Édition en cours dans l’aperçu : on ne l’écrase pas, on refera le rendu
+            self._pending_render = True
+            return
+
+        if error:
+            # Fallback robuste : on ne bloque pas l’appli si pandoc a un souci
+            self.preview.blockSignals(True)
+            try:
+                self.preview.setMarkdown(self._plain_text())
+            finally:
+                self.preview.blockSignals(False)
+            self._last_render_key = None
+            self.statusBar().showMessage(f"Aperçu Pandoc indisponible : {error}", 2500)
+        else:
+            key = self._pandoc_render_key
+            self._pandoc_html_cache[key] = html
+            if len(self._pandoc_html_cache) > PANDOC_HTML_CACHE_SIZE:
+                self._pandoc_html_cache.popitem(last=False)
+            self._apply_pandoc_html(key[0], html)
+        self._update_render_interval(ms)
+
+    def _segment_counts(self, segs: list[str], font: QFont,
+                        budget: int | None = None) -> list[int | None] | None:
+        """
+        Nombre de blocs de chaque segment (voir _segment_block_count), mémorisé par
+        texte de segment : seuls les segments jamais vus sont rendus. Avec un budget
+        (segs = tout le document), au plus budget rendus par appel ; None s’il ne
+        suffit pas, le comptage continue au prochain appel.
+        """
+        key = font.toString()
+        memo = self._segment_count_memo
+        if key != self._segment_count_font:
+            memo = self._segment_count_memo = {}
+            self._segment_count_font = key
+        elif budget is not None and len(memo) > 2 * len(segs) + budget:
+            # Segments disparus du document : on ne garde que ceux encore présents
+            memo = self._segment_count_memo = {x: memo[x] for x in segs if x in memo}
+        counts = []
+        for seg in segs:
+            if seg in memo:
+                counts.append(memo[seg])
+                continue
+            if budget is not None:
+                if budget == 0:
+                    return None
+                budget -= 1
+            memo[seg] = _segment_block_count(seg, font)
+            counts.append(memo[seg])
+        return counts
+
+    def _patch_preview(self, md: str) -> bool:
+        """
+        Aperçu incrémental : on compare les segments (blocs entre lignes vides) au
+        dernier rendu et on ne re-rend que la plage contiguë qui a changé
+        (au plus PATCH_MAX_SEGMENTS segments), ses blocs étant remplacés dans l’aperçu.
+        Renvoie False quand un rendu complet est nécessaire (trop de changements,
+        aperçu modifié à la main, constructions qui débordent d’un segment…).
+        """
+        old = self._preview_segments
+        pdoc = self.preview.document()
+        if old is None or pdoc.revision() != self._preview_revision:
+            return False
+        # Blocs de code (peuvent contenir des lignes vides), références, notes
+        if "```" in md or "~~~" in md or "]:" in md or "[^" in md:
+            return False
+        # Un élément de liste vide décale le rendu Qt de toute la suite du document
+        if EMPTY_ITEM_RE.search(md):
+            return False
+
+        segs = _split_segments(md)
+        if segs == old:
+            self._preview_segments = segs
+            return True
+
+        # Plage modifiée : old[a:ob] devient segs[a:nb] (préfixe et suffixe communs)
+        n_old, n_new = len(old), len(segs)
+        a = 0
+        while a < n_old and a < n_new and segs[a] == old[a]:
+            a += 1
+        ob, nb = n_old, n_new
+        while ob > a and nb > a and segs[nb - 1] == old[ob - 1]:
+            ob -= 1
+            nb -= 1
+        # Segment ajouté ou supprimé : on élargit à un voisin pour avoir des blocs à remplacer
+        if ob == a or nb == a:
+            if a > 0:
+                a -= 1
+            elif ob < n_old and nb < n_new:
+                ob += 1
+                nb += 1
+            else:
+                return False
+        if ob - a > PATCH_MAX_SEGMENTS or nb - a > PATCH_MAX_SEGMENTS:
+            return False
+        # Dernier segment : Qt traite à part la fin du document (bloc final, format
+        # de caractères du bloc), un fragment inséré ne la reproduit pas
+        if ob == n_old or nb == n_new:
+            return False
+
+        new_range = segs[a:nb]
+        prev_seg = segs[a - 1] if a > 0 else ""
+        next_seg = segs[nb] if nb < n_new else ""
+        if not all(_segment_is_isolated(x) for x in new_range + old[a:ob] + [prev_seg]):
+            return False
+        if next_seg[:1] in (" ", "\t"):
+            return False  # le segment suivant prolonge la plage
+        # Liste « aérée » répartie sur plusieurs segments (avant ou après modification)
+        for seq in ([prev_seg] + old[a:ob] + [next_seg], [prev_seg] + new_range + [next_seg]):
+            is_list = [_is_list_segment(x) for x in seq]
+            if any(is_list[i] and is_list[i + 1] for i in range(len(seq) - 1)):
+                return False
+
+        font = pdoc.defaultFont()
+        counts = self._preview_block_counts
+        if counts is None:
+            counts = self._segment_counts(old, font, PATCH_COUNT_BUDGET)
+            if counts is None:
+                return False
+            if None in counts or sum(counts) != pdoc.blockCount():
+                self._preview_segments = None
+                return False
+            self._preview_block_counts = counts
+
+        new_counts = self._segment_counts(new_range, font)
+        if None in new_counts:
+            return False
+        # Hors tête de document, rendu derrière un paragraphe factice : Qt ne donne
+        # pas au premier bloc d’un document le format de caractères (gras, taille…)
+        # qu’il a ailleurs
+        lead = 1 if a > 0 else 0
+        frag_doc = _render_segment("x\n\n" * lead + "\n\n".join(new_range), font)
+        if frag_doc.blockCount() != sum(new_counts) + lead:
+            return False
+        if not _fragment_is_patchable(frag_doc):
+            return False
+        b0 = frag_doc.findBlockByNumber(lead)
+        frag_cursor = QTextCursor(b0)
+        frag_cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        fragment = frag_cursor.selection()
+        first = sum(counts[:a])
+
+        cursor = QTextCursor(pdoc.findBlockByNumber(first))
+        last = pdoc.findBlockByNumber(first + sum(counts[a:ob]) - 1)
+        cursor.setPosition(last.position() + last.length() - 1, QTextCursor.KeepAnchor)
+
+        cursor.beginEditBlock()
+        cursor.removeSelectedText()
+        cursor.setBlockFormat(b0.blockFormat())
+        cursor.setBlockCharFormat(b0.charFormat())
+        if cursor.currentList() is not None:
+            cursor.currentList().remove(cursor.block())
+        cursor.insertFragment(fragment)
+        if b0.textList() is not None:
+            # Qt insère un bloc vide avant un fragment qui commence par une liste
+            blk = pdoc.findBlockByNumber(first)
+            if blk.length() == 1 and blk.textList() is None:
+                QTextCursor(blk.next()).deletePreviousChar()
+        cursor.endEditBlock()
+
+        counts[a:ob] = new_counts
+        self._preview_segments = segs
+        self._preview_revision = pdoc.revision()
+        if sum(counts) != pdoc.blockCount():
+            self._preview_segments = None
+            return False
+        return True
 
     def _render_preview_now(self, force: bool = False):
         if self._suspend_render and not force:
             self._pending_render = True
             return
+        # Personne ne voit l’aperçu : rendu différé jusqu’à son retour
+        if self._preview_hidden():
+            self._pending_render = True
+            self._pending_force = self._pending_force or force
+            return
+        force = force or self._pending_force
+        self._pending_force = False
+        # Texte identique au dernier rendu (frappe puis annulation…), aperçu non
+        # retouché, même moteur et, pour un gros document, même fenêtre autour du curseur
+        h = self._content_hash()
+        anchor = self._preview_window_anchor()
+        use_pandoc = self.has_pandoc and self.pandoc_preview_enabled
+        key = (h, self.preview.document().revision(), anchor, "pandoc" if use_pandoc else "qt")
+        if not force and key == self._last_render_key:
+            return
+
+        if use_pandoc:
+            # Pandoc (processus externe) tourne hors du thread GUI
+            self._preview_segments = None
+            self._last_rendered_md = None
+            self._start_pandoc_render(h)
+            return
+        # Un éventuel rendu Pandoc encore en route est désormais périmé
+        self._render_generation += 1
 
-        md = self.editor.toPlainText()
+        md = self._plain_text()
+        t0 = time.perf_counter()
+
+        if anchor is not None:
+            self._render_preview_window(md, anchor)
+            self._last_render_key = (h, self.preview.document().revision(), anchor, "qt")
+            self._update_render_interval((time.perf_counter() - t0) * 1000)
+            return
 
         self.preview.blockSignals(True)
         try:
-            if self.has_pandoc and self.pandoc_preview_enabled:
-                html = self._pandoc_markdown_to_html(md)
-                self.preview.setHtml(html)
-            else:
+            if force or not self._patch_preview(md):
                 self.preview.setMarkdown(md)
-        except Exception as e:
-            # Fallback robuste : on ne bloque pas l’appli si pandoc a un souci
-            self.preview.setMarkdown(md)
-            self.statusBar().showMessage(f"Aperçu Pandoc indisponible : {e}", 2500)
+                self._preview_segments = _split_segments(md)
+                self._preview_block_counts = None
+                self._preview_revision = self.preview.document().revision()
+            self._last_rendered_md = md
         finally:
             self.preview.blockSignals(False)
+        self._last_render_key = (h, self.preview.document().revision(), None, "qt")
+        self._update_render_interval((time.perf_counter() - t0) * 1000)
+
+    def _preview_window_anchor(self) -> int | None:
+        """
+        Ligne centrale de l’aperçu partiel (gros document, rendu Qt), ou None pour
+        un rendu complet. Elle ne suit le curseur que lorsqu’il s’en éloigne de
+        plus d’une demi-fenêtre : la frappe ne décale pas l’aperçu.
+        """
+        if self._content_len <= PREVIEW_WINDOW_MIN_CHARS or (self.has_pandoc and self.pandoc_preview_enabled):
+            self._preview_anchor = None
+            self._preview_anchor_scrolled = False
+            self._preview_window_lines = None
+            return None
+        if self._preview_anchor_scrolled:
+            return self._preview_anchor
+        line = self.editor.textCursor().blockNumber()
+        if self._preview_anchor is None or abs(line - self._preview_anchor) > PREVIEW_WINDOW_LINES // 2:
+            self._preview_anchor = line
+        return self._preview_anchor
+
+    def _render_preview_window(self, md: str, anchor: int):
+        """Aperçu partiel : seules les lignes autour de anchor passent par setMarkdown."""
+        lines = md.split("\n")
+        start, end = _preview_window(lines, anchor)
+        scroll_bar = self.preview.verticalScrollBar()
+        self.preview.blockSignals(True)
+        scroll_bar.blockSignals(True)
+        try:
+            self.preview.setMarkdown("\n".join(lines[start:end]))
+            keep = self._preview_scroll_keep
+            if keep is not None and start <= keep[0] <= end:
+                # Décalage au défilement : la ligne atteinte reste au même bord de la
+                # vue (position estimée en proportion des lignes rendues)
+                page = scroll_bar.pageStep()
+                y = (scroll_bar.maximum() + page) * (keep[0] - start) / max(1, end - start)
+                scroll_bar.setValue(int(y - page if keep[1] else y))
+        finally:
+            scroll_bar.blockSignals(False)
+            self.preview.blockSignals(False)
+        self._preview_scroll_keep = None
+        self._preview_window_lines = (start, end, len(lines))
+        # L’aperçu ne correspond pas au texte complet (pas de patch, pas de réutilisation à l’export)
+        self._preview_segments = None
+        self._last_rendered_md = None
+        key = self._last_render_key
+        if key is None or key[2] != anchor:
+            self.statusBar().showMessage(
+                f"Aperçu partiel (grand document) : lignes {start + 1}–{end} sur {len(lines)}", 2500
+            )
+
+    def _on_editor_cursor_moved(self):
+        # Fenêtre décalée par le défilement : elle suit de nouveau le curseur
+        self._preview_anchor_scrolled = False
+        # Aperçu partiel : le curseur est sorti de la fenêtre rendue => nouveau rendu
+        anchor = self._preview_anchor
+        if anchor is not None and abs(self.editor.textCursor().blockNumber() - anchor) > PREVIEW_WINDOW_LINES // 2:
+            self._render_due = time.monotonic() + self._render_interval_ms / 1000
+            self._schedule_work()
+
+    def _on_preview_scrolled(self):
+        """
+        Aperçu partiel défilé jusqu’en haut (ou en bas) alors que le document
+        continue : la fenêtre est recentrée sur ce bord, rendu différé comme
+        pour un déplacement du curseur.
+        """
+        window = self._preview_window_lines
+        scroll_bar = self.preview.verticalScrollBar()
+        if window is None or self._preview_anchor is None or scroll_bar.maximum() == 0:
+            return
+        start, end, total = window
+        # sliderPosition : déjà à jour quand actionTriggered est émis, avant value
+        value = scroll_bar.sliderPosition()
+        if value >= scroll_bar.maximum() and end < total:
+            self._preview_scroll_keep = (end, True)
+            anchor = end
+        elif value <= scroll_bar.minimum() and start > 0:
+            self._preview_scroll_keep = (start, False)
+            anchor = start
+        else:
+            return
+        if anchor == self._preview_anchor:
+            return  # décalage déjà demandé
+        self._preview_anchor = anchor
+        self._preview_anchor_scrolled = True
+        self._render_due = time.monotonic() + self._render_interval_ms / 1000
+        self._schedule_work()
+
+    def _update_render_interval(self, ms: float):
+        # Rendu lent (gros document) => on espace les rendus pendant la frappe
+        self._last_render_ms = ms
+        self._render_restart_count = 0
+        self._render_interval_ms = max(120, int(self._last_render_ms * 2.5))
 
     # ---------- File ops ----------
 
+    def _ask_path(self, dialog, title: str, filter_str: str) -> str:
+        """Dialogue de fichier ouvert sur le dernier dossier utilisé ; "" si annulé."""
+        path, _ = dialog(self, title, self._last_dir, filter_str)
+        if path:
+            self._last_dir = str(Path(path).parent)
+        return path
+
     def open_file(self):
-        path, _ = QFileDialog.getOpenFileName(
-            self, "Ouvrir un fichier Markdown", "", "Markdown (*.md *.markdown);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getOpenFileName, "Ouvrir un fichier Markdown", "Markdown (*.md *.markdown);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -1108,10 +2375,17 @@ class MainWindow(QMainWindow):
         except UnicodeDecodeError:
             text = p.read_text(encoding="utf-8", errors="replace")
 
+        large = len(text) > HIGHLIGHT_MAX_CHARS
+        if large:
+            self.highlighter.setDocument(None)
         self.editor.setPlainText(text)
+        if not large and self.highlighter.document() is None:
+            self.highlighter.setDocument(self.editor.document())
         self.current_path = p
-        self._dirty = False
-        self._last_autosaved_hash = None
+        self._settle_loaded_text()
+        # Le buffer correspond au fichier : rien à autosauver tant qu’on n’a pas tapé
+        self._last_autosaved_rev = self._text_rev
+        self._last_autosaved_hash = self._content_hash()
 
         self.statusBar().showMessage(f"Ouvert : {p.name}", 1500)
         self._render_preview_now(force=True)
@@ -1120,17 +2394,38 @@ class MainWindow(QMainWindow):
         if self.current_path is None:
             self.save_file_as()
             return
+        # Une autosave en cours ne doit pas écraser ce qu’on enregistre maintenant
+        self._autosave_pool.waitForDone()
+        # Autosave sur le même fichier : cette écriture la remplace
+        same_target = self._autosave_target() == self.current_path
+        if same_target:
+            self._autosave_pending = False
+            self._autosave_since = None
+            self._schedule_work()
+        rev = self._text_rev
+        h = self._content_hash()
+        # Ctrl+S répété : même texte, fichier pas retouché depuis notre écriture
+        saved = self._last_saved
+        if saved is not None and saved[:2] == (self.current_path, h) and (
+                saved[2] == _file_stamp(self.current_path)):
+            self._dirty = False
+            self.statusBar().showMessage(f"Déjà enregistré : {self.current_path.name}", 1500)
+            return
         try:
-            self.current_path.write_text(self.editor.toPlainText(), encoding="utf-8")
+            _atomic_write_bytes(self.current_path, self._utf8_bytes())
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Impossible d’enregistrer :\n{e}")
             return
         self._dirty = False
+        self._last_saved = (self.current_path, h, _file_stamp(self.current_path))
+        if same_target:
+            self._last_autosaved_rev = rev
+            self._last_autosaved_hash = h
         self.statusBar().showMessage(f"Enregistré : {self.current_path.name}", 1500)
 
     def save_file_as(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Enregistrer sous", "", "Markdown (*.md);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Enregistrer sous", "Markdown (*.md);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -1155,27 +2450,112 @@ class MainWindow(QMainWindow):
         if not self.cfg.enabled:
             return
 
-        md = self.editor.toPlainText()
-        h = hash(md)
+        if self._autosave_running is not None:
+            # Écriture déjà en cours : on relancera quand elle sera terminée
+            self._autosave_again = True
+            return
+        # Rien de neuf depuis la dernière autosave (ou depuis un save sur la même
+        # cible) ; un save vers un autre fichier ne dispense pas la cible d’autosave
+        rev = self._text_rev
+        if rev == self._last_autosaved_rev:
+            return
+        # Texte revenu à l’identique (frappe puis annulation…) : rien à écrire
+        h = self._content_hash()
         if h == self._last_autosaved_hash:
+            self._last_autosaved_rev = rev
             return
 
         target = self._autosave_target()
-        try:
-            target.write_text(md, encoding="utf-8")
-        except Exception as e:
-            # On ne spam pas de popups : juste un message bref
-            self.statusBar().showMessage(f"Autosave échoué : {e}", 2500)
-            return
-
-        self._last_autosaved_hash = h
-        self.statusBar().showMessage(f"Autosave : {target.name}", 900)
+        if target.parent != self._autosave_checked_dir:
+            # Nouveau dossier cible : droits vérifiés une fois, plutôt qu’un échec à chaque pause
+            if not os.access(target.parent, os.W_OK):
+                self.act_autosave.setChecked(False)
+                self.toggle_autosave(False)
+                self.statusBar().showMessage(
+                    f"Autosave désactivé : dossier non inscriptible ({target.parent})", 5000
+                )
+                return
+            self._autosave_checked_dir = target.parent
+        self._autosave_running = (rev, h, target)
+        self._autosave_pool.start(_AutosaveJob(self._utf8_bytes(), target, self._autosave_notifier))
+
+    def _on_autosave_finished(self, error: str):
+        rev, h, target = self._autosave_running
+        self._autosave_running = None
+
+        if error:
+            # On ne spam pas de popups : juste un message bref, et on espace les essais
+            self._autosave_fail_count = min(self._autosave_fail_count + 1, 16)
+            self.statusBar().showMessage(f"Autosave échoué : {error}", 2500)
+        else:
+            self._autosave_fail_count = 0
+            self._last_autosaved_rev = rev
+            self._last_autosaved_hash = h
+            self.statusBar().showMessage(f"Autosave : {target.name}", 900)
+
+        if self._autosave_again:
+            self._autosave_again = False
+            if error:
+                # Pas de nouvel essai immédiat : on repasse par l’échéance (avec délai)
+                self._queue_autosave()
+                self._schedule_work()
+            else:
+                self._autosave_now()
 
     # ---------- Exports ----------
 
+    def _export_up_to_date(self, out: Path, key: tuple, label: str) -> bool:
+        """
+        Même clé (texte, police) que notre dernier export vers out, et fichier pas
+        retouché depuis : rien à réécrire, un message suffit.
+        """
+        last = self._last_exports.get(out)
+        if last is None or last[0] != key or last[1] != _file_stamp(out):
+            return False
+        self.statusBar().showMessage(f"Export {label} déjà à jour : {out.name}", 1500)
+        return True
+
+    def _record_export(self, out: Path, key: tuple | None):
+        """Export réussi (key) ou échoué (None) vers out."""
+        stamp = _file_stamp(out) if key is not None else None
+        if stamp is None:
+            self._last_exports.pop(out, None)
+        else:
+            self._last_exports[out] = (key, stamp)
+
+    def _export_document(self, md: str) -> QTextDocument:
+        """
+        Document à exporter en HTML. Si l’aperçu affiche déjà exactement md
+        (rendu Qt à jour, non retouché dans l’aperçu), on le réutilise : pas de
+        second setMarkdown. Sinon, rendu dans un document d’export réutilisé, avec
+        la même police que l’aperçu, valable jusqu’à la prochaine frappe (exports
+        répétés : un seul rendu).
+        """
+        if (self._render_due is not None or self._frame_render_pending) and not (
+                self.has_pandoc and self.pandoc_preview_enabled):
+            # Rendu de l’aperçu en attente (frappe récente) : on le fait maintenant
+            # (patch incrémental) pour que l’export réutilise l’aperçu
+            self._render_due = None
+            self._frame_render_pending = False
+            self._schedule_work()
+            self._render_preview_now()
+        pdoc = self.preview.document()
+        if md == self._last_rendered_md and pdoc.revision() == self._preview_revision:
+            return pdoc
+        doc = self._export_scratch_doc
+        if doc is None:
+            doc = self._export_scratch_doc = QTextDocument()
+            doc.setUndoRedoEnabled(False)
+        elif self._export_scratch_md == md and doc.defaultFont() == pdoc.defaultFont():
+            return doc
+        doc.setDefaultFont(pdoc.defaultFont())
+        doc.setMarkdown(md)
+        self._export_scratch_md = md
+        return doc
+
     def export_html(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter en HTML", "", "HTML (*.html);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Exporter en HTML", "HTML (*.html);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -1183,21 +2563,26 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != ".html":
             out = out.with_suffix(".html")
 
-        md = self.editor.toPlainText()
-        doc = QTextDocument()
-        doc.setMarkdown(md)
+        key = (self._content_hash(), self.preview.document().defaultFont().toString())
+        if self._export_up_to_date(out, key, "HTML"):
+            return
+
+        md = self._plain_text()
+        doc = self._export_document(md)
         html = doc.toHtml()
 
         try:
             out.write_text(html, encoding="utf-8")
         except Exception as e:
+            self._record_export(out, None)
             QMessageBox.critical(self, "Erreur", f"Impossible d’exporter HTML :\n{e}")
             return
+        self._record_export(out, key)
         self.statusBar().showMessage(f"Export HTML : {out.name}", 1500)
 
     def export_pdf(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter en PDF", "", "PDF (*.pdf);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Exporter en PDF", "PDF (*.pdf);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -1205,25 +2590,29 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != ".pdf":
             out = out.with_suffix(".pdf")
 
-        md = self.editor.toPlainText()
-        doc = QTextDocument()
-        doc.setMarkdown(md)
-
-        printer = QPrinter(QPrinter.HighResolution)
-        printer.setOutputFormat(QPrinter.PdfFormat)
-        printer.setOutputFileName(str(out))
+        font = QFont(self.preview.document().defaultFont())
+        key = (self._content_hash(), font.toString())
+        if self._export_up_to_date(out, key, "PDF"):
+            return
 
-        try:
-            doc.print_(printer)
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Impossible d’exporter PDF :\n{e}")
+        # Rendu et impression (lents sur un gros document) dans un worker
+        self._pdf_queued.append((out, key))
+        self._export_pool.start(_PdfExportJob(self._plain_text(), font, out, self._pdf_notifier))
+        self.statusBar().showMessage("Export PDF en cours…")
+
+    def _on_pdf_exported(self, name: str, error: str, missing: bool):
+        out, key = self._pdf_queued.pop(0)
+        self._record_export(out, None if error else key)
+        if error:
+            self.statusBar().showMessage(f"Export PDF échoué : {name}", 2500)
+            QMessageBox.critical(self, "Erreur", f"Impossible d’exporter PDF :\n{error}")
             return
 
-        self.statusBar().showMessage(f"Export PDF : {out.name}", 1500)
+        self.statusBar().showMessage(f"Export PDF : {name}", 1500)
 
     def export_docx(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Exporter en DOCX", "", "Word (*.docx);;Tous les fichiers (*)"
+        path = self._ask_path(
+            QFileDialog.getSaveFileName, "Exporter en DOCX", "Word (*.docx);;Tous les fichiers (*)"
         )
         if not path:
             return
@@ -1231,20 +2620,32 @@ class MainWindow(QMainWindow):
         if out.suffix.lower() != ".docx":
             out = out.with_suffix(".docx")
 
-        md = self.editor.toPlainText()
-        try:
-            export_docx_from_markdown(md, out)
-        except ModuleNotFoundError:
+        key = (self._content_hash(), "")
+        if self._export_up_to_date(out, key, "DOCX"):
+            return
+
+        # Construction du document et écriture dans un worker : l’interface reste libre
+        self._docx_queued.append((out, key))
+        self._export_pool.start(_DocxExportJob(self._plain_text(), out, self._docx_notifier))
+        self.statusBar().showMessage("Export DOCX en cours…")
+
+    def _on_docx_exported(self, name: str, error: str, missing: bool):
+        out, key = self._docx_queued.pop(0)
+        self._record_export(out, None if (missing or error) else key)
+        if missing or error:
+            # Remplace « Export DOCX en cours… » avant la boîte d’erreur
+            self.statusBar().showMessage(f"Export DOCX échoué : {name}", 2500)
+        if missing:
             QMessageBox.critical(
                 self, "DOCX",
                 "Il manque la dépendance python-docx.\n\nInstalle : pip install python-docx"
             )
             return
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Impossible d’exporter DOCX :\n{e}")
+        if error:
+            QMessageBox.critical(self, "Erreur", f"Impossible d’exporter DOCX :\n{error}")
             return
 
-        self.statusBar().showMessage(f"Export DOCX : {out.name}", 1500)
+        self.statusBar().showMessage(f"Export DOCX : {name}", 1500)
 
 
 def main():
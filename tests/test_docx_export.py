@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Export DOCX : analyse du Markdown (_md_parse, _iter_inline_spans), sans Qt
+ni python-docx, puis document produit par export_docx_from_markdown.
+"""
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import Mini_Markdown_script as mms  # noqa: E402
+
+# Découpage inline d’origine (regex) : les parties capturées sont mises en forme,
+# les autres restent du texte littéral
+INLINE_RE = re.compile(r"(\*\*.+?\*\*|\*.+?\*|`.+?`)", re.DOTALL)
+
+
+def _regex_spans(text):
+    out = []
+    for i, part in enumerate(INLINE_RE.split(text)):
+        if not part:
+            continue
+        if i % 2 == 0:
+            out.append(("text", part))
+        elif part.startswith("**") and part.endswith("**") and len(part) >= 4:
+            out.append(("bold", part[2:-2]))
+        elif part.startswith("*"):
+            out.append(("italic", part[1:-1]))
+        else:
+            out.append(("code", part[1:-1]))
+    return out
+
+
+def _merged(spans):
+    """Segments texte consécutifs fusionnés (même rendu en runs DOCX)."""
+    out = []
+    for kind, payload in spans:
+        if kind == "text" and out and out[-1][0] == "text":
+            out[-1] = ("text", out[-1][1] + payload)
+        else:
+            out.append((kind, payload))
+    return out
+
+
+@pytest.mark.parametrize("text, spans", [
+    ("a **gras** b", [("text", "a "), ("bold", "gras"), ("text", " b")]),
+    ("*it* et `code`", [("italic", "it"), ("text", " et "), ("code", "code")]),
+    ("a ** b", [("text", "a ** b")]),
+    ("**", [("text", "**")]),
+    ("``", [("text", "``")]),
+    ("x * y", [("text", "x * y")]),
+])
+def test_inline_spans(text, spans):
+    assert _merged(mms._iter_inline_spans(text)) == spans
+
+
+def test_inline_spans_match_regex_split():
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = "".join(rng.choice("*`a \n") for _ in range(rng.randint(0, 10)))
+        assert _merged(mms._iter_inline_spans(text)) == _merged(_regex_spans(text)), repr(text)
+
+
+def test_md_parse_elements():
+    md = "# Titre\n\n- a *i*\n1. b\n\n```\nx = 1\n\ny\n```\nfin"
+    assert list(mms._md_parse(md)) == [
+        ("heading", 1, "Titre"),
+        ("blank",),
+        ("bullet", (("text", "a "), ("italic", "i"))),
+        ("num", (("text", "b"),)),
+        ("blank",),
+        ("code", ("x = 1", "", "y")),
+        ("para", (("text", "fin"),)),
+    ]
+
+
+def test_md_parse_line_breaks():
+    # Seuls \r\n, \r et \n coupent une ligne ; \f, \x85, U+2028… restent dans le texte
+    md = "a\x0cb\r\nc d\re\x85f\n"
+    assert list(mms._md_parse(md)) == [
+        ("para", (("text", "a\x0cb"),)),
+        ("para", (("text", "c d"),)),
+        ("para", (("text", "e\x85f"),)),
+        ("blank",),
+    ]
+
+
+@pytest.fixture
+def exported(tmp_path):
+    docx = pytest.importorskip("docx")
+
+    def export(md):
+        out = tmp_path / "out.docx"
+        mms.export_docx_from_markdown(md, out)
+        return docx.Document(str(out))
+    return export
+
+
+def test_docx_stray_delimiter_stays_literal(exported):
+    doc = exported("*i* a ** b")
+    runs = [(r.text, bool(r.bold), bool(r.italic)) for r in doc.paragraphs[0].runs]
+    assert runs == [("i", False, True), (" a ** b", False, False)]
+
+
+def test_docx_code_block_is_one_paragraph(exported):
+    doc = exported("```\nl1\n\nl3\n```")
+    (p,) = doc.paragraphs
+    assert p.text == "l1\n\nl3"
+    assert len(p._p.xpath(".//w:br")) == 2
+
+
+def test_docx_blank_lines_become_spacing(exported):
+    from docx.shared import Pt
+
+    doc = exported("# T\n\n\n\npara\nsuite\n\nfin")
+    assert [p.text for p in doc.paragraphs] == ["T", "para", "suite", "fin"]
+    assert [p.paragraph_format.space_after for p in doc.paragraphs] == [Pt(6), None, Pt(6), None]
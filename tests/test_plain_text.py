@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Copie du texte de l’éditeur : après toute suite de modifications (rejouées
+par découpage de chaînes), _plain_text() doit valoir editor.toPlainText().
+"""
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+
+from PySide6.QtGui import QTextCursor  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import Mini_Markdown_script as mms  # noqa: E402
+
+# Retours à la ligne (dont U+2028), tabulation, espace insécable, accents
+SNIPPETS = ["a", "mot ", "\n", "\n\n", "\t", "\xa0", "é", "**", "\u2028"]
+
+
+@pytest.fixture(scope="module")
+def window():
+    app = QApplication.instance() or QApplication([])
+    w = mms.MainWindow()
+    w.show()
+    app.processEvents()
+    yield w
+    w.close()
+
+
+@pytest.mark.parametrize("extra", [[], ["😀"]], ids=["bmp", "non-bmp"])
+@pytest.mark.parametrize("seed", range(3))
+def test_random_edits_keep_plain_text(window, seed, extra):
+    # Caractère hors BMP : positions Qt en UTF-16, la copie est refaite en entier
+    snippets = SNIPPETS + extra
+    rng = random.Random(seed)
+    editor = window.editor
+    editor.setPlainText("# Titre\n\nTexte de départ\n")
+    for _ in range(300):
+        n = editor.document().characterCount() - 1
+        cursor = editor.textCursor()
+        r = rng.random()
+        if r < 0.1:
+            editor.undo()
+        elif r < 0.25 and n:
+            i = rng.randrange(n)
+            cursor.setPosition(i)
+            cursor.setPosition(min(n, i + rng.randint(1, 8)), QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        else:
+            cursor.setPosition(rng.randint(0, n))
+            cursor.insertText(rng.choice(snippets))
+        # Lecture pas à chaque fois : plusieurs changements s’accumulent à rejouer
+        if rng.random() < 0.3:
+            assert window._plain_text() == editor.toPlainText()
+    assert window._plain_text() == editor.toPlainText()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Aperçu incrémental : après chaque modification, l’aperçu patché doit être
+identique à un rendu complet (setMarkdown) du même texte.
+"""
+import os
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6")
+
+from PySide6.QtGui import QTextCursor  # noqa: E402
+from PySide6.QtWidgets import QApplication, QTextEdit  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import Mini_Markdown_script as mms  # noqa: E402
+
+BASE = (
+    "# Titre\n\nTexte **gras** et\nsuite *it*\n\n## H2\n\n"
+    "fin `c` [lien](http://x)\n\n> cit\n\n- a\n- b\n\npara\n"
+)
+SNIPPETS = [
+    "a", " ", "**", "*", "`", "word", "\n", "\n\n", "# ", "## ", "#", "> ", ">",
+    "---", "- ", "1. ", "***", "___", "=", "\n===", "\n---", "[l](u)", "\n- item",
+]
+
+
+def _dump(doc):
+    """Blocs du document : texte, formats de bloc et de caractères, listes."""
+    out = []
+    block = doc.begin()
+    while block.isValid():
+        bf, cf, tl = block.blockFormat(), block.charFormat(), block.textList()
+        out.append((
+            block.text(), bf.headingLevel(), bf.topMargin(), bf.bottomMargin(),
+            bf.leftMargin(), bf.indent(), cf.fontPointSize(), cf.fontWeight(),
+            tl.format().style() if tl else None, tl.itemNumber(block) if tl else None,
+            [(f.start, f.length, f.format.fontWeight(), f.format.fontItalic(),
+              f.format.fontFixedPitch(), f.format.isAnchor(), f.format.fontPointSize())
+             for f in block.textFormats()],
+        ))
+        block = block.next()
+    return out
+
+
+@pytest.fixture(scope="module")
+def window():
+    app = QApplication.instance() or QApplication([])
+    w = mms.MainWindow()
+    w.show()
+    app.processEvents()
+    yield w
+    w.close()
+
+
+def _full_render(w, md):
+    ref = QTextEdit()
+    ref.document().setDefaultFont(w.preview.document().defaultFont())
+    ref.setMarkdown(md)
+    return _dump(ref.document())
+
+
+def _set_text(w, md):
+    w.editor.setPlainText(md)
+    w._render_preview_now(force=True)
+
+
+@pytest.mark.parametrize("before, after", [
+    ("a\n\nb\n\nc", "a\n\n> \n\nc"),
+    ("a\n\nb\n\nc", "a\n\n---\n\nc"),
+    ("x\n\nx", "x\n\n#"),
+    ("x\n\n#\n\n", "x\n\n##\n\n"),
+    ("1\n\n\n### r\n\n*i*\n", "1\n\n\n###"),
+    ("t\n\n#H\n\np", "t\n\n# H\n\np"),
+    ("2\n\n``\n\nf", "2\n\n`**`\n\nf"),
+    ("*[n](h*)\n\np", "*[n](***h*)\n\np"),
+])
+def test_patch_matches_full_render(window, before, after):
+    _set_text(window, before)
+    cursor = QTextCursor(window.editor.document())
+    cursor.select(QTextCursor.Document)
+    cursor.insertText(after)
+    window._render_preview_now()
+    assert _dump(window.preview.document()) == _full_render(window, after)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_edits_match_full_render(window, seed):
+    rng = random.Random(seed)
+    _set_text(window, BASE)
+    for _ in range(200):
+        md = window.editor.toPlainText()
+        cursor = window.editor.textCursor()
+        if rng.random() < 0.15 and md:
+            i = rng.randrange(len(md))
+            cursor.setPosition(i)
+            cursor.setPosition(min(len(md), i + rng.randint(1, 6)), QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        else:
+            cursor.setPosition(rng.randint(0, len(md)))
+            cursor.insertText(rng.choice(SNIPPETS))
+        if len(window.editor.toPlainText()) > 600:
+            _set_text(window, BASE)
+            continue
+        window._render_preview_now()
+        md = window.editor.toPlainText()
+        assert _dump(window.preview.document()) == _full_render(window, md), repr(md)